@@ -6,8 +6,10 @@ import logging
 
 # system packages
 import random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 # external packages
 import dspy
@@ -35,7 +37,18 @@ log = logging.getLogger(__name__)
 
 
 def lm_from_dict(lm_config: dict):
-    """Load a language model from a dictionary of parameters.
+    """Load a language model from a dictionary of parameters. Any dspy.LM parameter
+    may be set, for example to ride out rate limits when running many threads:
+
+    .. code-block:: python
+
+        {
+            "model": "openai/gpt-4o",
+            "api_key": !env OPENAI_API_KEY,
+            "cache": true,
+            "num_retries": 8,               # retries with backoff, defaults to 8
+            "timeout": 60                   # seconds per request (optional)
+        }
 
     :param lm_config: Dictionary containing language model parameters.
     :type lm_config: dict
@@ -130,6 +143,35 @@ def mlflow_data_helper_from_yaml(yaml_path: Union[str, Path]) -> MlflowDataHelpe
 #######################
 # Data Methods        #
 #######################
+@lru_cache(maxsize=8)
+def _local_trainset(
+    data_helper_type: str, parse_objects: bool, cache_dir: Optional[str] = None
+) -> Tuple[dspy.Example, ...]:
+    """Load the trainset of the local schemas, memoized per process so that loading
+    the trainset and evalset of several configs parses the schemas only once.
+
+    :param data_helper_type: Type of data helper to use (quality, generation).
+    :type data_helper_type: str
+    :param parse_objects: Whether to parse the objects in the dataset.
+    :type parse_objects: bool
+    :param cache_dir: Directory to cache the parsed dataset in across processes.
+    :type cache_dir: Optional[str]
+    :return: The trainset.
+    :rtype: Tuple[dspy.Example, ...]
+
+    """
+    # TODO: refactor to enable the passing of alternative schema_directory_path,
+    # and the related enums that must be passed in turn
+    ldh = LocalDataHelper()
+    dh = (
+        QualityDataHelper() if data_helper_type == "quality" else GenerationDataHelper()
+    )
+    dataset = ldh.folder_of_folders_to_dataset(
+        parse_objects=parse_objects, cache_dir=cache_dir
+    )
+    return tuple(dh.trainset(dataset))
+
+
 def trainset_from_dict(trainset_dict: dict) -> List[dspy.Example]:
     """Load a trainset from a dictionary of parameters.
 
@@ -153,6 +195,8 @@ def trainset_from_dict(trainset_dict: dict) -> List[dspy.Example]:
             "local_parse_objects": true,                # Whether to parse the objects
                                                         # in the dataset
                                                         # (if load_from_local is true)
+            "local_cache_dir": null,                    # Directory to cache the parsed
+                                                        # dataset in (optional)
             "split_for_eval": true,                     # Whether to split the dataset
                                                         # into trainset and evalset
             "trainset_size": 1000,                      # The size of the trainset
@@ -167,15 +211,7 @@ def trainset_from_dict(trainset_dict: dict) -> List[dspy.Example]:
     :rtype: List[dspy.Example]
 
     """
-    # TODO: refactor to enable the passing of alternative schema_directory_path,
-    # and the related enums that must be passed in turn
-    ldh = LocalDataHelper()
-
-    if trainset_dict["data_helper_type"] == "quality":
-        dh = QualityDataHelper()
-    elif trainset_dict["data_helper_type"] == "generation":
-        dh = GenerationDataHelper()
-    else:
+    if trainset_dict["data_helper_type"] not in ("quality", "generation"):
         raise ValueError(
             f"Invalid data helper type: {trainset_dict['data_helper_type']}"
         )
@@ -186,15 +222,18 @@ def trainset_from_dict(trainset_dict: dict) -> List[dspy.Example]:
     if trainset_dict["load_from_local"]:
         if trainset_dict["load_local_specific_category"]:
             raise NotImplementedError("loading a specific category is not implemented")
-        dataset = ldh.folder_of_folders_to_dataset(
-            parse_objects=trainset_dict["local_parse_objects"]
+        trainset = _local_trainset(
+            trainset_dict["data_helper_type"],
+            trainset_dict["local_parse_objects"],
+            trainset_dict.get("local_cache_dir", None),
         )
-        trainset = dh.trainset(dataset)
         if trainset_dict["trainset_size"] and isinstance(
             trainset_dict["trainset_size"], int
         ):
             trainset = trainset[: trainset_dict["trainset_size"]]
-        return trainset
+        # copy the memoized examples, so that changes made to them (e.g. by an
+        # optimizer) do not leak into later trainsets (with_inputs returns a copy)
+        return [example.with_inputs(*example.inputs().keys()) for example in trainset]
     else:
         raise ValueError(
             "Current implementation only supports loading from local directory"
@@ -219,6 +258,8 @@ def trainset_from_yaml(yaml_path: Union[str, Path]) -> List[dspy.Example]:
             local_parse_objects: true,              # Whether to parse the objects
                                                     # in the dataset
                                                     # (if load_from_local is true)
+            local_cache_dir: null                   # Directory to cache the parsed
+                                                    # dataset in (optional)
             split_for_eval: true,                   # Whether to split the dataset
                                                     # into trainset and evalset
             trainset_size: 1000,                    # The size of the trainset
@@ -248,16 +289,18 @@ def split_trainset(
     :type trainset: List[dspy.Example]
     :param evalset_ratio: The proportionate size of the evalset.
     :type evalset_ratio: float
+    :param seed: The seed for the shuffle.
+    :type seed: int
     :return: A tuple of trainset and evalset.
     :rtype: tuple[List[dspy.Example], List[dspy.Example]]
 
     """
-    random.seed(seed)
-    split_idx = int(len(trainset) * (1 - evalset_ratio))
-    random.shuffle(trainset)
-    evalset = trainset[split_idx:]
-    trainset = trainset[:split_idx]
-    return trainset, evalset
+    # shuffle a copy with a local generator, leaving both the caller's list and
+    # the global random state untouched (the order matches random.seed(seed))
+    shuffled = list(trainset)
+    random.Random(seed).shuffle(shuffled)
+    split_idx = int(len(shuffled) * (1 - evalset_ratio))
+    return shuffled[:split_idx], shuffled[split_idx:]
 
 
 def trainset_and_evalset_from_yaml(
@@ -280,6 +323,8 @@ def trainset_and_evalset_from_yaml(
             local_parse_objects: true,              # Whether to parse the objects
                                                     # in the dataset
                                                     # (if load_from_local is true)
+            local_cache_dir: null                   # Directory to cache the parsed
+                                                    # dataset in (optional)
             split_for_eval: true,                   # Whether to split the dataset
                                                     # into trainset and evalset
             trainset_size: 1000,                    # The size of the trainset
@@ -433,7 +478,8 @@ def single_trainer_from_dict(
                 "class": "DocQualityTrainer",
                 "mlflow_model_name": "doc_quality_model",
                 "mlflow_experiment_name": "doc_quality_experiment",
-                "mlflow_tracking_uri": "http://localhost:5000"
+                "mlflow_tracking_uri": "http://localhost:5000",
+                "num_threads": 32            # optional, defaults to 32
             },
             "optimizer": {
                 "optimizer_type": "miprov2",
@@ -468,6 +514,7 @@ def single_trainer_from_dict(
             mlflow_tracking_uri=trainer_dict["trainer"]["mlflow_tracking_uri"],
             trainset=trainset,
             evalset=evalset,
+            num_threads=trainer_dict["trainer"].get("num_threads", 32),
         )
     except Exception as e:
         log.error(f"Error creating single trainer: {e}")
@@ -492,6 +539,8 @@ def single_trainer_from_yaml(yaml_path: Union[str, Path]) -> SinglePromptTrainer
             local_parse_objects: true,              # Whether to parse the objects
                                                     # in the dataset
                                                     # (if load_from_local is true)
+            local_cache_dir: null                   # Directory to cache the parsed
+                                                    # dataset in (optional)
             split_for_eval: true,                   # Whether to split the dataset
                                                     # into trainset and evalset
             trainset_size: 1000,                    # The size of the trainset
@@ -545,7 +594,8 @@ def doc_generator_module_from_dict(
             "retry": true,
             "retry_limit": 1,
             "rating_threshold": 3,
-            "fill_empty_descriptions": true
+            "fill_empty_descriptions": true,
+            "num_threads": 32                   # optional, defaults to 32
         }
 
     :param module_dict: Dictionary containing module parameters.
@@ -562,6 +612,7 @@ def doc_generator_module_from_dict(
         retry_limit=module_dict["retry_limit"],
         rating_threshold=module_dict["rating_threshold"],
         fill_empty_descriptions=module_dict["fill_empty_descriptions"],
+        num_threads=module_dict.get("num_threads", 32),
     )
 
 
@@ -607,6 +658,8 @@ def doc_generator_module_from_yaml(yaml_path: Union[str, Path]) -> DocGeneratorM
             rating_threshold: 3             # The rating threshold for the quality check
             fill_empty_descriptions: true   # Whether to fill empty descriptions with
                                             # generated documentation
+            num_threads: 32                 # The number of threads used to document
+                                            # schema components (optional)
 
     :param yaml_path: Path to the YAML file.
     :type yaml_path: Union[str, Path]
@@ -668,6 +721,10 @@ def doc_generator_eval_from_yaml(yaml_path: Union[str, Path]) -> DocGeneratorEva
             generator_prediction_field: documented_schema         # The field in the generator prediction to use
             evaluator_prediction_field: rating                    # The field in the evaluator prediction to use
             readable_value: 25
+            cache_dir: null                                       # Directory to cache documented schemas in (optional)
+            num_threads: 32                                       # The number of schemas documented concurrently (optional)
+            component_language_model: null                        # A language model to rate the schema components with, same keys as language_model (optional)
+            rate_full_schema: true                                # Whether to rate the full schema, or weight the component ratings by length (optional)
 
     :param yaml_path: Path to the YAML file.
     :type yaml_path: Union[str, Path]
@@ -675,16 +732,25 @@ def doc_generator_eval_from_yaml(yaml_path: Union[str, Path]) -> DocGeneratorEva
     :rtype: DocGeneratorEvaluator
 
     """  # noqa: B950
-    # set the dspy language model
-    dspy_lm_from_yaml(yaml_path)
+    # the evalset is loaded in the background while the prompts are loaded (possibly
+    # from mlflow), the dspy settings are only changed from this thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        evalset_future = executor.submit(trainset_from_yaml, yaml_path)
 
-    # load the generator
-    generator = doc_generator_module_from_yaml(yaml_path)
-    config = load_yaml_config(yaml_path)
+        # load the generator (this also sets the dspy language model)
+        generator = doc_generator_module_from_yaml(yaml_path)
+        config = load_yaml_config(yaml_path)
+
+        # load the evaluator, reusing the generator's metric prompt when it has one
+        # rather than building (and possibly loading from mlflow) the same prompt
+        generator_metric = generator.prompt.prompt_metric
+        if isinstance(generator_metric, SinglePrompt):
+            evaluator = generator_metric
+        else:
+            metric_config = config["prompt_metric"]
+            evaluator = single_prompt_from_dict(metric_config, metric_config["metric"])
 
-    # load the evaluator
-    metric_config = config["prompt_metric"]
-    evaluator = single_prompt_from_dict(metric_config, metric_config["metric"])
+        evalset = evalset_future.result()
 
     # load the mlflow data helper
     mdh = mlflow_data_helper_from_yaml(yaml_path)  # noqa: F841
@@ -694,9 +760,11 @@ def doc_generator_eval_from_yaml(yaml_path: Union[str, Path]) -> DocGeneratorEva
     generator_prediction_field = config["eval"]["generator_prediction_field"]
     evaluator_prediction_field = config["eval"]["evaluator_prediction_field"]
     readable_value = config["eval"]["readable_value"]
-
-    # load the evalset
-    evalset = trainset_from_yaml(yaml_path)
+    cache_dir = config["eval"].get("cache_dir", None)
+    num_threads = config["eval"].get("num_threads", 32)
+    component_lm_config = config["eval"].get("component_language_model", None)
+    component_lm = lm_from_dict(component_lm_config) if component_lm_config else None
+    rate_full_schema = config["eval"].get("rate_full_schema", True)
 
     # return the evaluator
     return DocGeneratorEvaluator(
@@ -708,4 +776,8 @@ def doc_generator_eval_from_yaml(yaml_path: Union[str, Path]) -> DocGeneratorEva
         generator_prediction_field=generator_prediction_field,
         evaluator_prediction_field=evaluator_prediction_field,
         readable_value=readable_value,
+        num_threads=num_threads,
+        cache_dir=cache_dir,
+        component_lm=component_lm,
+        rate_full_schema=rate_full_schema,
     )
@@ -3,6 +3,7 @@
 
 # system packages
 import logging
+from functools import cache
 from typing import Any, Optional, Union
 
 # external packages
@@ -48,9 +49,7 @@ class GenerationDataHelper(DspyDataHelper):
     @staticmethod
     def model_signature() -> ModelSignature:
         # TODO: decide if this should be here or in the mlflow_data_helper
-        example = GenerationDataHelper.example_example().toDict()
-        example.pop("documented_schema")
-        return infer_signature(example)
+        return _generation_model_signature()
 
     @staticmethod
     def prediction(inputs: dict[str, Any]) -> dspy.Prediction:
@@ -79,8 +78,8 @@ class GenerationDataHelper(DspyDataHelper):
         if isinstance(inputs, Dataset):
             # TODO: here is where we will want to enable post-processing of the inputs
             examples = []
-            for i in range(len(inputs)):
-                item = inputs[i]
+            # convert the arrow table once rather than indexing row by row
+            for i, item in enumerate(inputs.to_list()):
                 database_schema = item.get("schema_str", None)
                 documented_schema = item.get("schema_str", None)
                 if database_schema is None or documented_schema is None:
@@ -96,3 +95,11 @@ class GenerationDataHelper(DspyDataHelper):
         raise ValueError(
             f"inputs must be a dictionary or a datasets, not: {type(inputs)}"
         )
+
+
+@cache
+def _generation_model_signature() -> ModelSignature:
+    # the signature is static, so it is only inferred once per process
+    example = GenerationDataHelper.example_example().toDict()
+    example.pop("documented_schema")
+    return infer_signature(example)
@@ -3,6 +3,7 @@
 
 # system packages
 import logging
+from functools import cache
 from typing import Any, Optional, Union
 
 # external packages
@@ -54,10 +55,7 @@ class QualityDataHelper(DspyDataHelper):
     @staticmethod
     def model_signature() -> ModelSignature:
         # TODO: decide if this should be here or in the mlflow_data_helper
-        example = QualityDataHelper.example_example().toDict()
-        example.pop("category")
-        example.pop("rating")
-        return infer_signature(example)
+        return _quality_model_signature()
 
     @staticmethod
     def prediction(inputs: dict[str, Any]) -> dspy.Prediction:
@@ -87,8 +85,8 @@ class QualityDataHelper(DspyDataHelper):
             raise NotImplementedError("from dictionary is not implemented")
         if isinstance(inputs, Dataset):
             examples = []
-            for i in range(len(inputs)):
-                item = inputs[i]
+            # convert the arrow table once rather than indexing row by row
+            for i, item in enumerate(inputs.to_list()):
                 database_schema = item.get("schema_str", None)
                 category = item.get("category", None)
                 rating = int(item.get("rating", None))
@@ -106,3 +104,12 @@ class QualityDataHelper(DspyDataHelper):
         raise ValueError(
             f"inputs must be a dictionary or a datasets, not: {type(inputs)}"
         )
+
+
+@cache
+def _quality_model_signature() -> ModelSignature:
+    # the signature is static, so it is only inferred once per process
+    example = QualityDataHelper.example_example().toDict()
+    example.pop("category")
+    example.pop("rating")
+    return infer_signature(example)
@@ -6,10 +6,9 @@ import logging
 # system packages
 import os
 from pathlib import Path
-from typing import Literal, Union
+from typing import Literal, Type, Union
 
 import yaml
-from yaml import SafeLoader
 
 # internal packages
 
@@ -18,6 +17,9 @@ from yaml import SafeLoader
 # logging
 log = logging.getLogger(__name__)
 
+# prefer the libyaml bindings, falling back to the pure python loader
+_BaseLoader: Type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def check_directory_path(directory_path: Union[str, Path]) -> None:
     """Check if the provided path resolves to a valid directory.
@@ -53,7 +55,7 @@ def check_file_path(file_path: Union[str, Path]) -> None:
         )
 
 
-def _env_constructor(loader: SafeLoader, node: yaml.nodes.ScalarNode) -> str:
+def _env_constructor(loader: yaml.SafeLoader, node: yaml.nodes.ScalarNode) -> str:
     """Custom constructor for environment variables.
 
     :param loader: The YAML loader.
@@ -72,6 +74,38 @@ def _env_constructor(loader: SafeLoader, node: yaml.nodes.ScalarNode) -> str:
     return env_value
 
 
+class _EnvSafeLoader(_BaseLoader):
+    """A safe loader that resolves ``!env`` tags from the environment."""
+
+
+_EnvSafeLoader.add_constructor("!env", _env_constructor)
+
+
+class _RedactedSafeLoader(_BaseLoader):
+    """A safe loader that replaces ``!env`` tags with ``replace_value``."""
+
+    replace_value: str = "redacted"
+
+
+def _redacted_env_constructor(
+    loader: _RedactedSafeLoader, node: yaml.nodes.ScalarNode
+) -> str:
+    """Custom constructor for redacted environment variables.
+
+    :param loader: The YAML loader.
+    :type loader: _RedactedSafeLoader
+    :param node: The node to construct.
+    :type node: yaml.nodes.ScalarNode
+    :return: The loader's replacement value.
+    :rtype: str
+
+    """
+    return loader.replace_value
+
+
+_RedactedSafeLoader.add_constructor("!env", _redacted_env_constructor)
+
+
 def load_yaml_config(file_path: Union[str, Path], use_env: bool = True) -> dict:
     """Load a YAML configuration file.
 
@@ -85,16 +119,13 @@ def load_yaml_config(file_path: Union[str, Path], use_env: bool = True) -> dict:
         variable is not set.
 
     """
-    if use_env:
-        SafeLoader.add_constructor("!env", _env_constructor)
-
     _file_path = Path(file_path).resolve()
     if not _file_path.is_file():
         raise ValueError(
             f"The provided path does not resolve to a valid file: {file_path}"
         )
     with open(_file_path, "r") as file:
-        return yaml.load(file, Loader=SafeLoader)
+        return yaml.load(file, Loader=_EnvSafeLoader if use_env else _BaseLoader)
 
 
 def load_yaml_config_redacted(
@@ -111,12 +142,6 @@ def load_yaml_config_redacted(
     :raises ValueError: If the path does not resolve to a valid file.
 
     """
-
-    def _redacted_env_constructor(loader, node):
-        return replace_value
-
-    SafeLoader.add_constructor("!env", _redacted_env_constructor)
-
     _file_path = Path(file_path).resolve()
     if not _file_path.is_file():
         raise ValueError(
@@ -124,7 +149,12 @@ def load_yaml_config_redacted(
         )
 
     with open(_file_path, "r") as file:
-        return yaml.load(file, Loader=SafeLoader)
+        loader = _RedactedSafeLoader(file)
+        loader.replace_value = replace_value
+        try:
+            return loader.get_single_data()
+        finally:
+            loader.dispose()
 
 
 def setup_logging(
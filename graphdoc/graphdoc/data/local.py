@@ -2,13 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # system packages
+import hashlib
 import logging
+import os
+import shutil
 from enum import Enum
 from pathlib import Path
 from typing import Callable, Dict, Optional, Type, Union
 
 # external packages
-from datasets import Dataset, concatenate_datasets
+from datasets import Dataset
 
 # internal packages
 from graphdoc.data.helper import check_directory_path, check_file_path
@@ -19,6 +22,7 @@ from graphdoc.data.schema import (
     SchemaCategoryRatingMapping,
     SchemaObject,
     SchemaRating,
+    schema_objects_to_dataset,
 )
 
 # logging
@@ -179,15 +183,53 @@ class LocalDataHelper:
                         objects.append(parsed_object)
             objects.append(schema_object)
 
-        return concatenate_datasets(
-            [schema_object.to_dataset() for schema_object in objects]
+        return schema_objects_to_dataset(objects)
+
+    def _dataset_cache_key(
+        self,
+        folder_paths: Type[Enum],
+        parse_objects: bool,
+        type_mapping: Optional[dict[type, str]],
+    ) -> str:
+        """Hash the schema files, loading arguments and labels into a dataset cache key.
+
+        :param folder_paths: Enum class defining folder paths
+        :type folder_paths: Type[Enum]
+        :param parse_objects: Whether the objects are parsed from the schemas
+        :type parse_objects: bool
+        :param type_mapping: A dictionary mapping graphql-ast node values to strings
+        :type type_mapping: Optional[dict[type, str]]
+        :return: The hex digest identifying the dataset
+        :rtype: str
+
+        """
+        root = Path(self.schema_directory_path)
+        key = hashlib.sha256()
+        key.update(repr((folder_paths.__name__, parse_objects, type_mapping)).encode())
+        categories_ratings = getattr(
+            self.categories_ratings, "__qualname__", repr(self.categories_ratings)
+        )
+        key.update(
+            repr(
+                (
+                    list(self.categories),
+                    list(self.ratings),
+                    f"{self.categories_ratings.__module__}.{categories_ratings}",
+                )
+            ).encode()
         )
+        for schema_file in sorted(p for p in root.rglob("*") if p.is_file()):
+            stat = schema_file.stat()
+            name = schema_file.relative_to(root)
+            key.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return key.hexdigest()
 
     def folder_of_folders_to_dataset(
         self,
         folder_paths: Type[Enum] = SchemaCategoryPath,
         parse_objects: bool = True,
         type_mapping: Optional[dict[type, str]] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
     ) -> Dataset:
         """Load a folder of folders containing schemas, keeping the difficulty tag.
 
@@ -198,10 +240,39 @@ class LocalDataHelper:
         :type parse_objects: bool
         :param type_mapping: A dictionary mapping graphql-ast node values to strings
         :type type_mapping: Optional[dict[type, str]]
+        :param cache_dir: A directory to cache the dataset in. The cached dataset is
+            keyed on the schema files and arguments, and is reused until either change.
+        :type cache_dir: Optional[Union[str, Path]]
         :return: A dataset containing the schemas
         :rtype: Dataset
 
         """
+        if cache_dir is not None:
+            cache_path = Path(cache_dir) / self._dataset_cache_key(
+                folder_paths, parse_objects, type_mapping
+            )
+            if cache_path.is_dir():
+                log.info(f"Loading cached dataset from {cache_path}")
+                return Dataset.load_from_disk(str(cache_path))
+            dataset = self.folder_of_folders_to_dataset(
+                folder_paths=folder_paths,
+                parse_objects=parse_objects,
+                type_mapping=type_mapping,
+            )
+            # write to a temporary directory so that a failed save is never loaded
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            dataset.save_to_disk(str(tmp_path))
+            try:
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # another process wrote the same dataset first, keep its copy
+                shutil.rmtree(tmp_path)
+                if not cache_path.is_dir():
+                    raise
+                log.info(f"Loading cached dataset from {cache_path}")
+                return Dataset.load_from_disk(str(cache_path))
+            return dataset
+
         schema_objects = self.schema_objects_from_folder_of_folders(
             folder_paths=folder_paths
         )
@@ -217,9 +288,7 @@ class LocalDataHelper:
                     for parsed_object in parsed_objects.values():
                         objects.append(parsed_object)
             objects.append(schema_object)
-        return concatenate_datasets(
-            [schema_object.to_dataset() for schema_object in objects]
-        )
+        return schema_objects_to_dataset(objects)
 
     # def _get_graph_doc_columns # we should move this to a huggingface file
 
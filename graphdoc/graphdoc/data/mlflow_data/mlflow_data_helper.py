@@ -2,12 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import ast
+import copy
 import logging
 
 # system packages
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 # external packages
 import dspy
@@ -20,6 +23,16 @@ from mlflow.models import ModelSignature
 # logging
 log = logging.getLogger(__name__)
 
+# loaded models, keyed on the tracking uri and the artifact source of the model. The
+# artifacts of a model version never change, so the cache is never invalidated.
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# the latest version of a registered model, keyed on the tracking uri and the model
+# name. New versions can be registered at any time, so entries expire after a while.
+_LATEST_VERSION_TTL = 60.0
+_LATEST_VERSION_CACHE: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
 
 class MlflowDataHelper:
     def __init__(
@@ -75,17 +88,48 @@ class MlflowDataHelper:
     #########################
     # Model Loading Methods #
     #########################
+    def _load_model(self, model_source: str):
+        """Load a model from mlflow, caching the loaded model per process. A copy of
+        the cached model is returned, so callers are free to modify (or optimize) the
+        model they are given.
+
+        :param model_source: The source uri of the model to load.
+        :type model_source: str
+        :return: The loaded model.
+
+        """
+        key = (str(self.mlflow_tracking_uri), model_source)
+        with _MODEL_CACHE_LOCK:
+            model = _MODEL_CACHE.get(key)
+        if model is None:
+            model = mlflow.dspy.load_model(model_source)
+            with _MODEL_CACHE_LOCK:
+                model = _MODEL_CACHE.setdefault(key, model)
+        return copy.deepcopy(model)
+
     # TODO: add return type and error handling
     def latest_model_version(self, model_name: str):
-        """Load the latest version of a model from mlflow.
+        """Load the latest version of a model from mlflow. The latest version is looked
+        up at most once a minute per model, or again after a new version is saved.
 
         :param model_name: The name of the model to load.
         :type model_name: str
         :return: The loaded model.
 
         """
-        model_latest_version = self.mlflow_client.get_latest_versions(model_name)
-        return mlflow.dspy.load_model(model_latest_version[0].source)
+        key = (str(self.mlflow_tracking_uri), model_name)
+        with _MODEL_CACHE_LOCK:
+            cached = _LATEST_VERSION_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _LATEST_VERSION_TTL:
+            model_latest_version = cached[1]
+        else:
+            model_latest_version = self.mlflow_client.get_latest_versions(model_name)
+            with _MODEL_CACHE_LOCK:
+                _LATEST_VERSION_CACHE[key] = (time.monotonic(), model_latest_version)
+        source = model_latest_version[0].source
+        if source is None:
+            raise ValueError(f"Latest version of model {model_name} has no source")
+        return self._load_model(source)
 
     # TODO: add return type and error handling
     def model_by_name_and_version(self, model_name: str, model_version: str):
@@ -99,7 +143,11 @@ class MlflowDataHelper:
 
         """
         model = self.mlflow_client.get_model_version(model_name, model_version)
-        return mlflow.dspy.load_model(model.source)
+        if model.source is None:
+            raise ValueError(
+                f"Model {model_name} version {model_version} has no source"
+            )
+        return self._load_model(model.source)
 
     # TODO: add return type and error handling
     def model_by_uri(self, model_uri: str):
@@ -110,7 +158,11 @@ class MlflowDataHelper:
         :return: The loaded model.
 
         """
-        return mlflow.dspy.load_model(model_uri)
+        # registry uris can be re-pointed at a different version, so they are
+        # resolved on every call
+        if model_uri.startswith("models:/"):
+            return mlflow.dspy.load_model(model_uri)
+        return self._load_model(model_uri)
 
     def model_by_args(self, load_model_args: Dict[str, str]):
         # TODO: refactor this to use a more elegant method
@@ -157,6 +209,9 @@ class MlflowDataHelper:
             task=None,
             registered_model_name=model_name,
         )  # TODO: add metadata related to trainset and evalset
+        # the model now has a new latest version
+        with _MODEL_CACHE_LOCK:
+            _LATEST_VERSION_CACHE.pop((str(self.mlflow_tracking_uri), model_name), None)
 
     ############################
     # Metadata Loading Methods #
@@ -65,6 +65,7 @@ class Parser:
     def parse_schema_from_file(
         schema_file: Union[str, Path],
         schema_directory_path: Optional[Union[str, Path]] = None,
+        no_location: bool = False,
     ) -> DocumentNode:
         """Parse a schema from a file.
 
@@ -72,6 +73,8 @@ class Parser:
         :type schema_file: Union[str, Path]
         :param schema_directory_path: A path to a directory containing schemas
         :type schema_directory_path: Optional[Union[str, Path]]
+        :param no_location: Whether to skip recording source locations on the nodes
+        :type no_location: bool
         :return: The parsed schema
         :rtype: DocumentNode
         :raises Exception: If the schema cannot be parsed
@@ -86,7 +89,7 @@ class Parser:
 
         try:
             schema = schema_path.read_text()
-            return parse(schema)
+            return parse(schema, no_location=no_location)
         except Exception as e:
             log.error(f"Error parsing schema from file: {e}")
             raise e
@@ -301,7 +304,8 @@ class Parser:
     ) -> SchemaObject:
         """Parse a schema object from a file."""
         try:
-            schema_ast = Parser.parse_schema_from_file(schema_file)
+            # the schema is re-printed below, so the source locations are not needed
+            schema_ast = Parser.parse_schema_from_file(schema_file, no_location=True)
             schema_str = print_ast(schema_ast)
             schema_type = Parser._check_node_type(schema_ast)
             return SchemaObject.from_dict(
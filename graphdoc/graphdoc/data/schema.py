@@ -8,7 +8,7 @@ from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Type, Union
 
-from datasets import Dataset, Features, Value, concatenate_datasets
+from datasets import Dataset, Features, Value
 
 # external packages
 from graphql import Node
@@ -272,6 +272,12 @@ def schema_objects_to_dataset(schema_objects: List[SchemaObject]) -> Dataset:
     :return: The Hugging Face Dataset
 
     """
-    return concatenate_datasets(
-        [schema_object.to_dataset() for schema_object in schema_objects]
-    )
+    # build the columns in one pass, as creating (and fingerprinting) a dataset per
+    # object and concatenating them is far slower than a single from_dict
+    columns = SchemaObject._hf_schema_object_columns()
+    dictionary: dict[str, list] = {column: [] for column in columns}
+    for schema_object in schema_objects:
+        for column, value in schema_object.to_dict().items():
+            if column in dictionary:
+                dictionary[column].append(value)
+    return Dataset.from_dict(dictionary, features=columns)
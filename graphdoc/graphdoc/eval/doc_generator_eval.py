@@ -2,13 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # system packages
+import hashlib
 import logging
-from typing import Any, List, Union
+import os
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Union
 
 # external packages
 import dspy
 import mlflow
-from graphql import parse, print_ast
+import numpy as np
+from graphql import GraphQLError, parse, print_ast
 
 # internal packages
 from graphdoc.data import MlflowDataHelper
@@ -34,6 +39,10 @@ class DocGeneratorEvaluator(dspy.Module):
         generator_prediction_field: str = "documented_schema",
         evaluator_prediction_field: str = "rating",
         readable_value: int = 25,
+        num_threads: int = 32,
+        cache_dir: Optional[Union[str, Path]] = None,
+        component_lm: Optional[dspy.LM] = None,
+        rate_full_schema: bool = True,
     ):
         """A simple module for evaluating the quality of generated documentation. We
         will make this extensible to include more complex evaluation metrics in the
@@ -42,6 +51,23 @@ class DocGeneratorEvaluator(dspy.Module):
         Important: we assume that the rating values returned by the evaluator are
         [1, 2, 3, 4]. We will make this more flexible in the future.
 
+        The evalset is documented in parallel, and the components of each documented
+        schema are rated in parallel, each using up to num_threads threads.
+
+        If cache_dir is provided, documented schemas are cached on disk, keyed on the
+        sha256 of the normalized input schema and the generator's prompts, demos,
+        language model and settings, so re-running an evaluation skips the generator
+        for schemas it has already documented. Only successful generations are
+        cached, a schema the generator fell back on is documented again next time.
+
+        If component_lm is provided, the components are rated with it (for example a
+        smaller or local model), while the full schema is still rated with the
+        configured dspy language model.
+
+        If rate_full_schema is False, the full schema is not rated separately, and
+        its overall rating is the average of the component ratings weighted by the
+        length of each component. This saves the largest rating call per schema.
+
         """
         self.generator = generator
         self.evaluator = evaluator
@@ -51,10 +77,74 @@ class DocGeneratorEvaluator(dspy.Module):
         self.evaluator_prediction_field = evaluator_prediction_field
         self.mlflow_experiment_name = mlflow_experiment_name
         self.readable_value = readable_value
+        self.num_threads = num_threads
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.component_lm = component_lm
+        self.rate_full_schema = rate_full_schema
+
+    def _rate(self, examples: List[dspy.Example]) -> List[Any]:
+        """Rate a list of examples concurrently. Failed ratings are returned as None."""
+        # a failed rating only zeroes its own component, rather than discarding
+        # every rating of the schema, so the batch is never cancelled on errors
+        return self.evaluator.infer.batch(
+            examples,
+            num_threads=self.num_threads,
+            max_errors=len(examples) + 1,
+            disable_progress_bar=True,
+        )
+
+    def _generator_key(self) -> str:
+        """Identify the generator's prompts, demos, language model and settings for
+        the cache."""
+        # (we assume we are using DocGeneratorModule, falling back to a dspy.Module)
+        prompt = getattr(self.generator, "prompt", None)
+        modules = [
+            getattr(prompt, "infer", None),
+            getattr(getattr(prompt, "prompt_metric", None), "infer", None),
+        ]
+        if not isinstance(modules[0], dspy.Module):
+            modules = [self.generator]
+        predictors = [
+            predictor
+            for module in modules
+            if isinstance(module, dspy.Module)
+            for predictor in module.predictors()
+        ]
+        settings = [
+            getattr(self.generator, setting, None)
+            for setting in (
+                "retry",
+                "retry_limit",
+                "rating_threshold",
+                "fill_empty_descriptions",
+            )
+        ]
+        default_lm = getattr(dspy.settings.lm, "model", None)
+        return repr(
+            [default_lm, settings]
+            + [
+                (
+                    repr(predictor.signature),
+                    repr(predictor.demos),
+                    getattr(predictor.lm, "model", default_lm),
+                )
+                for predictor in predictors
+            ]
+        )
+
+    def _document(self, database_schema: str) -> str:
+        """Document a database schema, reading from and writing through to the on-disk
+        cache if one is configured."""
+        cache_path = None
+        if self.cache_dir is not None:
+            key = hashlib.sha256(self._generator_key().encode("utf-8"))
+            key.update(print_ast(parse(database_schema)).encode("utf-8"))
+            cache_path = self.cache_dir / f"{key.hexdigest()}.graphql"
+            if cache_path.exists():
+                return cache_path.read_text(encoding="utf-8")
 
-    def forward(self, database_schema: str) -> dict[str, Any]:
-        """Takes a database schema, documents it, and then evaluates each component and
-        the aggregate."""
         # (we assume we are using DocGeneratorModule)
         generator_result = self.generator.document_full_schema(  # type: ignore
             database_schema=database_schema,
@@ -68,31 +158,26 @@ class DocGeneratorEvaluator(dspy.Module):
         # not as a prediction object.
         documented_schema = getattr(generator_result, self.generator_prediction_field)
 
-        try:
-            documented_ast = parse(documented_schema)
-            component_ratings = []
-            for node in documented_ast.definitions:
-                p = self.evaluator.infer(database_schema=print_ast(node))
-                # TODO: let's decide if this is how we want to handle this,
-                # or if we should standardize the return type of the evaluator.
-                rating = getattr(p, self.evaluator_prediction_field)
-                rating = rating * self.readable_value if rating != 1 else 0
-                component_ratings.append(rating)
-
-            overall_p = self.evaluator.infer(database_schema=documented_schema)
-            overall_rating = getattr(overall_p, self.evaluator_prediction_field)
-            overall_rating = (
-                overall_rating * self.readable_value if overall_rating != 1 else 0
+        # the generator falls back to the input schema on errors, which must not be
+        # served from the cache on later evaluations
+        if cache_path is not None and getattr(generator_result, "status", "OK") == "OK":
+            # write to a temporary file first so concurrent readers never see a
+            # partially written schema
+            tmp_path = cache_path.with_suffix(
+                f".{os.getpid()}.{threading.get_ident()}.tmp"
             )
+            tmp_path.write_text(documented_schema, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        return documented_schema
 
-            return {
-                "overall_rating": overall_rating,
-                "average_component_rating": sum(component_ratings)
-                / len(component_ratings),
-                "component_ratings": component_ratings,
-            }
+    def forward(self, database_schema: str) -> dict[str, Any]:
+        """Takes a database schema, documents it, and then evaluates each component and
+        the aggregate."""
+        documented_schema = self._document(database_schema)
 
-        except Exception as e:
+        try:
+            documented_ast = parse(documented_schema)
+        except GraphQLError as e:
             log.warning(f"Generated schema was not valid GraphQL: {e}")
             document_ast = parse(database_schema)
             # TODO: we should have a dynamic way of knowing the rating values
@@ -103,20 +188,83 @@ class DocGeneratorEvaluator(dspy.Module):
                 "component_ratings": [0] * len(document_ast.definitions),
             }
 
+        # rate each component and the full schema (if rated) concurrently, the full
+        # schema is rated last
+        # (the components are sliced from the source rather than re-printed, the
+        # generator already returns a printed schema so the text is the same)
+        components = [
+            documented_schema[node.loc.start : node.loc.end]  # type: ignore
+            for node in documented_ast.definitions
+        ]
+        schemas = list(components)
+        if self.rate_full_schema:
+            schemas.append(documented_schema)
+        examples = [
+            dspy.Example(database_schema=schema).with_inputs("database_schema")
+            for schema in schemas
+        ]
+        if self.component_lm is None:
+            predictions = self._rate(examples)
+        else:
+            n_components = len(components)
+            with dspy.context(lm=self.component_lm):
+                predictions = self._rate(examples[:n_components])
+            if self.rate_full_schema:
+                predictions += self._rate(examples[n_components:])
+        failed = sum(p is None for p in predictions)
+        if failed:
+            log.warning(f"{failed} of {len(predictions)} ratings failed, rated as 0")
+
+        # TODO: let's decide if this is how we want to handle this,
+        # or if we should standardize the return type of the evaluator.
+        # (failed ratings are treated as the lowest rating, which reads as 0)
+        ratings = np.fromiter(
+            (
+                getattr(p, self.evaluator_prediction_field) if p is not None else 1
+                for p in predictions
+            ),
+            dtype=np.int64,
+            count=len(predictions),
+        )
+        ratings = np.where(ratings == 1, 0, ratings * self.readable_value)
+        if self.rate_full_schema:
+            component_ratings, overall_rating = ratings[:-1], ratings[-1]
+        else:
+            component_ratings = ratings
+            overall_rating = np.average(
+                ratings, weights=[len(component) for component in components]
+            )
+
+        return {
+            "overall_rating": overall_rating.item(),
+            "average_component_rating": float(component_ratings.mean()),
+            "component_ratings": component_ratings.tolist(),
+        }
+
     def evaluate(self):
         """Batches the evaluation set and logs the results to mlflow."""
         mlflow.set_experiment(self.mlflow_experiment_name)
         with mlflow.start_run():
-            evaluation_results = self.batch(self.evalset, num_threads=32)
-            avg_overall_rating = sum(
-                [x["overall_rating"] for x in evaluation_results]
-            ) / len(evaluation_results)
-            avg_component_rating = sum(
-                [x["average_component_rating"] for x in evaluation_results]
-            ) / len(evaluation_results)
-
-            mlflow.log_metric("average_overall_rating", avg_overall_rating)
-            mlflow.log_metric("average_component_rating", avg_component_rating)
+            evaluation_results = self.batch(self.evalset, num_threads=self.num_threads)
+            failed = sum(x is None for x in evaluation_results)
+            if failed:
+                log.warning(f"{failed} of {len(evaluation_results)} examples failed")
+            evaluation_results = [x for x in evaluation_results if x is not None]
+            if not evaluation_results:
+                raise ValueError("No examples in the evaluation set were evaluated")
+            avg_overall_rating = float(
+                np.mean([x["overall_rating"] for x in evaluation_results])
+            )
+            avg_component_rating = float(
+                np.mean([x["average_component_rating"] for x in evaluation_results])
+            )
+
+            mlflow.log_metrics(
+                {
+                    "average_overall_rating": avg_overall_rating,
+                    "average_component_rating": avg_component_rating,
+                }
+            )
             mlflow.log_dict(
                 {
                     "component_ratings": [
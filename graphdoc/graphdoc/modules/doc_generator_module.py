@@ -3,13 +3,12 @@
 
 # system packages
 import logging
-import queue
-from typing import Any, Literal, Optional, Union
+from typing import Any, Dict, Literal, Optional, Union
 
 # external packages
 import dspy
 import mlflow
-from graphql import parse, print_ast
+from graphql import DocumentNode, parse, print_ast
 
 # internal packages
 from graphdoc.data import Parser
@@ -29,6 +28,7 @@ class DocGeneratorModule(dspy.Module):
         rating_threshold: int = 3,
         fill_empty_descriptions: bool = True,
         token_tracker: Optional[TokenTracker] = None,
+        num_threads: int = 32,
     ) -> None:
         """Initialize the DocGeneratorModule. A module for generating documentation for
         a given GraphQL schema. Schemas are decomposed and individually used to generate
@@ -50,6 +50,12 @@ class DocGeneratorModule(dspy.Module):
         :param fill_empty_descriptions: Whether to fill empty descriptions with
                                         generated documentation.
         :type fill_empty_descriptions: bool
+        :param token_tracker: The token tracker used to record api usage.
+        :type token_tracker: Optional[TokenTracker]
+        :param num_threads: The number of threads used to document the components of
+                            a schema concurrently. Documentation is I/O bound, so
+                            this can be sized to the provider's rate limits.
+        :type num_threads: int
 
         """
         super().__init__()
@@ -63,6 +69,8 @@ class DocGeneratorModule(dspy.Module):
         self.fill_empty_descriptions = fill_empty_descriptions
         self.par = Parser()
         self.token_tracker = TokenTracker() if token_tracker is None else token_tracker
+        self.num_threads = num_threads
+        self._experiment_ids: Dict[str, str] = {}
 
         # ensure that the doc generator prompt metric is set to rating
         if self.prompt.prompt_metric.prompt_metric != "rating":
@@ -84,15 +92,19 @@ class DocGeneratorModule(dspy.Module):
         inputs: dict,
         attributes: dict,
     ):
-        # set the experiment name so that everything is logged to the same experiment
-        mlflow.set_experiment(expirement_name)
+        # set the experiment name so that everything is logged to the same experiment,
+        # the experiment is only resolved the first time, later traces pass its id
+        experiment_id = self._experiment_ids.get(expirement_name)
+        if experiment_id is None:
+            experiment_id = mlflow.set_experiment(expirement_name).experiment_id
+            self._experiment_ids[expirement_name] = experiment_id
 
         # start the trace
         trace = client.start_trace(
             name=trace_name,
             inputs=inputs,
             attributes=attributes,
-            # experiment_id=expirement_name,
+            experiment_id=experiment_id,
         )
 
         return trace
@@ -110,14 +122,14 @@ class DocGeneratorModule(dspy.Module):
     #######################
     # MODULE FUNCTIONS    #
     #######################
-    def _retry_by_rating(self, database_schema: str) -> str:
+    def _retry_by_rating(self, database_schema: str) -> dspy.Prediction:
         """Retry the generation if the quality check fails. Rating threshold is
         determined at initialization.
 
         :param database_schema: The database schema to generate documentation for.
         :type database_schema: str
-        :return: The generated documentation.
-        :rtype: str
+        :return: The generated documentation and its status.
+        :rtype: dspy.Prediction
 
         """
 
@@ -134,18 +146,23 @@ class DocGeneratorModule(dspy.Module):
 
         retries = 0
         rating = 0
-        pred_database_schema = None
+        prediction = None
+        feedback = None
         while retries < self.retry_limit:
             # first pass, generate the documentation
-            prediction = self._predict(database_schema=database_schema)
-            pred_database_schema = prediction.documented_schema
+            prediction = self._predict(
+                database_schema=database_schema, feedback=feedback
+            )
 
             # get the rating for the documentation
-            rating_prediction = _try_rating(database_schema=pred_database_schema)
-            rating = rating_prediction.rating
-            log.info(
-                "Current rating (attempt #" + str(retries + 1) + "): " + str(rating)
+            rating_prediction = _try_rating(
+                database_schema=prediction.documented_schema
             )
+            rating = rating_prediction.rating
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "Current rating (attempt #" + str(retries + 1) + "): " + str(rating)
+                )
 
             # if the rating is above the threshold, return the documentation
             if rating >= self.rating_threshold:
@@ -155,47 +172,47 @@ class DocGeneratorModule(dspy.Module):
                         + str(retries + 1)
                         + ")"
                     )
-                return pred_database_schema
-            log.info(
-                "The rating prediction is (attempt #"
-                + str(retries + 1)
-                + "): "
-                + str(rating_prediction)
-            )
+                return prediction
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "The rating prediction is (attempt #"
+                    + str(retries + 1)
+                    + "): "
+                    + str(rating_prediction)
+                )
 
             # if the rating is below the threshold, prepare for a retry
             if self.prompt.prompt_metric.prompt_type == "chain_of_thought":
                 log.info("Adding reasoning returned from the rating prediction")
                 reason = rating_prediction.reasoning
-                reason_database_schema = (
-                    f"# The documentation was previously generated "
+                feedback = (
+                    f"The documentation was previously generated "
                     f"and received a low quality rating "
                     f"because of the following reasoning: {reason}. "
-                    f"Remove this comment in the documentation you generate\n"
-                    + database_schema
+                    f"Remove this comment in the documentation you generate"
                 )
             else:
-                reason_database_schema = (
-                    f"# This documentation was considered {rating_prediction.category}, "
+                feedback = (
+                    f"This documentation was considered {rating_prediction.category}, "
                     f"please attempt again to generate the documentation properly. "
-                    f"Remove this comment in the documentation you generate\n"
-                    + database_schema
+                    f"Remove this comment in the documentation you generate"
                 )
 
             # prepare for the next retry
-            database_schema = reason_database_schema
             retries += 1
 
         log.warning(
             "Retry limit reached. Returning the last documented schema with rating: "
             + str(rating)
         )
-        if pred_database_schema is None:
+        if prediction is None:
             log.warning("No documented schema returned from retries")
-            return database_schema
-        return pred_database_schema
+            return dspy.Prediction(documented_schema=database_schema, status="ERROR")
+        return prediction
 
-    def _predict(self, database_schema: str) -> dspy.Prediction:
+    def _predict(
+        self, database_schema: str, feedback: Optional[str] = None
+    ) -> dspy.Prediction:
         """Given a database schema, generate a documented schema. Performs the following
         steps:
 
@@ -207,7 +224,11 @@ class DocGeneratorModule(dspy.Module):
 
         :param database_schema: The database schema to generate documentation for.
         :type database_schema: str
-        :return: The generated documentation.
+        :param feedback: Feedback on a previous attempt, passed to the model as a
+            comment above the (normalized) schema.
+        :type feedback: Optional[str]
+        :return: The generated documentation, with a status of "ERROR" if the input
+            schema is returned in place of generated documentation.
         :rtype: dspy.Prediction
 
         """
@@ -216,7 +237,7 @@ class DocGeneratorModule(dspy.Module):
             database_ast = parse(database_schema)
         except Exception as e:
             log.warning("Invalid GraphQL schema provided at onset: " + str(e))
-            return dspy.Prediction(documented_schema=database_schema)
+            return dspy.Prediction(documented_schema=database_schema, status="ERROR")
 
         # fill the empty descriptions
         if self.fill_empty_descriptions:
@@ -225,27 +246,36 @@ class DocGeneratorModule(dspy.Module):
         else:
             database_schema = print_ast(database_ast)
 
+        # the feedback is added after normalizing, as printing the ast drops comments
+        # (this also keeps retries from hitting the cached response of the first try)
+        prompt_schema = database_schema
+        if feedback:
+            prompt_schema = f"# {feedback}\n" + database_schema
+
         # try to generate the schema
         try:
-            prediction = self.prompt.infer(database_schema=database_schema)
-            log.info("Generated schema: " + str(prediction.documented_schema))
+            prediction = self.prompt.infer(database_schema=prompt_schema)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Generated schema: " + str(prediction.documented_schema))
         except Exception as e:
             log.warning("Error generating schema: " + str(e))
-            return dspy.Prediction(documented_schema=database_schema)
+            return dspy.Prediction(documented_schema=database_schema, status="ERROR")
 
         # check that the generated schema is valid
         try:
             prediction_ast = parse(prediction.documented_schema)
         except Exception as e:
             log.warning("Invalid GraphQL schema generated: " + str(e))
-            return dspy.Prediction(documented_schema=database_schema)
+            return dspy.Prediction(documented_schema=database_schema, status="ERROR")
 
         # check that the generated schema matches the original schema
         if self.par.schema_equality_check(database_ast, prediction_ast):
-            return dspy.Prediction(documented_schema=prediction.documented_schema)
+            return dspy.Prediction(
+                documented_schema=prediction.documented_schema, status="OK"
+            )
         else:
             log.warning("Generated schema does not match the original schema")
-            return dspy.Prediction(documented_schema=database_schema)
+            return dspy.Prediction(documented_schema=database_schema, status="ERROR")
 
     def forward(self, database_schema: str) -> dspy.Prediction:
         """Given a database schema, generate a documented schema. If retry is True, the
@@ -265,13 +295,11 @@ class DocGeneratorModule(dspy.Module):
                     self.token_tracker.all_tasks_done.set()
 
         if self.retry:
-            database_schema = self._retry_by_rating(database_schema=database_schema)
-            _update_active_tasks()
-            return dspy.Prediction(documented_schema=database_schema)
+            prediction = self._retry_by_rating(database_schema=database_schema)
         else:
             prediction = self._predict(database_schema=database_schema)
-            _update_active_tasks()
-            return prediction
+        _update_active_tasks()
+        return prediction
 
     def document_full_schema(
         self,
@@ -294,7 +322,8 @@ class DocGeneratorModule(dspy.Module):
         :type expirement_name: str
         :param logging_id: The id to use for logging. Maps back to the user request.
         :type logging_id: str
-        :return: The generated documentation.
+        :return: The generated documentation, with a status of "ERROR" if it failed
+            the equality check or any component fell back to its input schema.
         :rtype: dspy.Prediction
 
         """
@@ -340,45 +369,41 @@ class DocGeneratorModule(dspy.Module):
         self.token_tracker.all_tasks_done.clear()
 
         # batch generate the documentation
-        documented_examples = self.batch(examples, num_threads=32)
-        document_ast.definitions = tuple(
-            parse(ex.documented_schema)
-            for ex in documented_examples  # type: ignore
-            # TODO: we should have better type handling, but we know this works
+        documented_examples = self.batch(examples, num_threads=self.num_threads)
+        # build a new document rather than mutating the parsed schema, so that the
+        # parsed schema can be reused for the equality check below
+        documented_ast = DocumentNode(
+            definitions=tuple(
+                parse(ex.documented_schema)
+                for ex in documented_examples  # type: ignore
+                # TODO: we should have better type handling, but we know this works
+            )
         )
 
         # token tracker details
         self.token_tracker.all_tasks_done.wait()
-        callbacks_during_run = 0
-        while True:
-            try:
-                data = self.token_tracker.callback_queue.get(timeout=2)
-                with self.token_tracker.callback_lock:
-                    self.token_tracker.api_call_count += 1
-                    self.token_tracker.model_name = data.get("model", "unknown")
-                    self.token_tracker.completion_tokens += data.get(
-                        "completion_tokens", 0
-                    )
-                    self.token_tracker.prompt_tokens += data.get("prompt_tokens", 0)
-                    self.token_tracker.total_tokens += data.get("total_tokens", 0)
-                callbacks_during_run += 1
-                self.token_tracker.callback_queue.task_done()
-            except queue.Empty:
-                log.info("Queue empty after timeout, assuming all callbacks processed")
-                break
+        self.token_tracker.process_callback_queue(timeout=2)
 
-        # check that the generated schema matches the original schema
-        if self.par.schema_equality_check(parse(database_schema), document_ast):
+        # check that the generated schema matches the original schema, a component
+        # that fell back to its input schema is also reported as an error
+        if self.par.schema_equality_check(document_ast, documented_ast):
             log.info("Schema equality check passed, returning documented schema")
-            return_schema = print_ast(document_ast)
-            status = "OK"
+            return_schema = print_ast(documented_ast)
+            status = (
+                "OK"
+                if all(
+                    ex.get("status", "OK") == "OK"
+                    for ex in documented_examples  # type: ignore
+                )
+                else "ERROR"
+            )
         else:
             log.warning("Generated schema does not match the original schema")
             if self.fill_empty_descriptions:
-                updated_ast = self.par.fill_empty_descriptions(document_ast)
+                updated_ast = self.par.fill_empty_descriptions(documented_ast)
                 return_schema = print_ast(updated_ast)
             else:
-                return_schema = print_ast(document_ast)
+                return_schema = print_ast(documented_ast)
             status = "ERROR"
 
         if trace:
@@ -401,4 +426,4 @@ class DocGeneratorModule(dspy.Module):
         # clear the token tracker
         self.token_tracker.clear()
 
-        return dspy.Prediction(documented_schema=return_schema)
+        return dspy.Prediction(documented_schema=return_schema, status=status)
@@ -24,6 +24,7 @@ class TokenTracker:
         self.api_call_count = 0
         self.completion_tokens = 0
         self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
         self.total_tokens = 0
         self.active_tasks = 0
         self.callback_lock = threading.Lock()
@@ -39,6 +40,7 @@ class TokenTracker:
         self.model_name = ""
         self.completion_tokens = 0
         self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
         self.total_tokens = 0
         self.active_tasks = 0
 
@@ -49,9 +51,37 @@ class TokenTracker:
             "api_call_count": self.api_call_count,
             "completion_tokens": self.completion_tokens,
             "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
             "total_tokens": self.total_tokens,
         }
 
+    def process_callback_queue(self, timeout: float = 2) -> int:
+        """Add the usage queued by the callback to the token tracker's totals.
+
+        :param timeout: Seconds to wait for a queued callback before assuming all
+            callbacks were processed.
+        :type timeout: float
+        :return: The number of callbacks processed.
+        :rtype: int
+
+        """
+        callbacks_processed = 0
+        while True:
+            try:
+                data = self.callback_queue.get(timeout=timeout)
+                with self.callback_lock:
+                    self.api_call_count += 1
+                    self.model_name = data.get("model", "unknown")
+                    self.completion_tokens += data.get("completion_tokens", 0)
+                    self.prompt_tokens += data.get("prompt_tokens", 0)
+                    self.cached_prompt_tokens += data.get("cached_prompt_tokens", 0)
+                    self.total_tokens += data.get("total_tokens", 0)
+                callbacks_processed += 1
+                self.callback_queue.task_done()
+            except queue.Empty:
+                log.info("Queue empty after timeout, assuming all callbacks processed")
+                return callbacks_processed
+
     def global_token_callback(
         self, kwargs, response, start_time, end_time, **callback_kwargs
     ):
@@ -60,13 +90,18 @@ class TokenTracker:
         Intended to be used with the litellm ModelResponse object.
 
         """
+        # prompt tokens served from the provider's prompt cache (e.g. openai's
+        # automatic caching of a repeated prompt prefix), when reported. litellm
+        # reports the details as a pydantic model, which dict() also accepts
+        details = dict(response.get("usage", {}).get("prompt_tokens_details") or {})
         data = {
             "model": response.get("model", "unknown"),
             "completion_tokens": response.get("usage", {}).get("completion_tokens", 0),
             "prompt_tokens": response.get("usage", {}).get("prompt_tokens", 0),
+            "cached_prompt_tokens": details.get("cached_tokens", None) or 0,
             "total_tokens": response.get("usage", {}).get("total_tokens", 0),
         }
         self.callback_queue.put(data)
-        log.info(
+        log.debug(
             f"Callback triggered, queued data, thread: {threading.current_thread().name}"
         )
@@ -3,7 +3,7 @@
 
 # system packages
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 # external packages
 import dspy
@@ -32,14 +32,18 @@ class TrainerFactory:
         mlflow_tracking_uri: str,
         mlflow_model_name: str,
         mlflow_experiment_name: str,
-        trainset: List[dspy.Example],
+        trainset: Iterable[dspy.Example],
         evalset: List[dspy.Example],
+        num_threads: int = 32,
     ):
         """Returns an instance of the specified trainer class."""
         # update any potentially missing or conflicting values
         optimizer_kwargs["metric"] = prompt.evaluate_metric
         optimizer_kwargs["student"] = prompt.infer
         optimizer_kwargs["trainset"] = trainset
+        # optimizers evaluate candidates with the same concurrency as the trainer,
+        # unless the config sets it explicitly
+        optimizer_kwargs.setdefault("num_threads", num_threads)
 
         trainer_classes = {
             "DocQualityTrainer": DocQualityTrainer,
@@ -58,6 +62,7 @@ class TrainerFactory:
                 mlflow_experiment_name=mlflow_experiment_name,
                 trainset=trainset,
                 evalset=evalset,
+                num_threads=num_threads,
             )
         except Exception as e:
             raise ValueError(
@@ -74,6 +79,4 @@ __all__ = [
     "optimizer_compile",
     "SinglePrompt",
     "SinglePromptTrainer",
-    "DocGeneratorTrainer",
-    "DocQualityTrainer",
 ]
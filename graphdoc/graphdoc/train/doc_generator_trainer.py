@@ -3,12 +3,12 @@
 
 # system packages
 import logging
-import math
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # external packages
 import dspy
 import mlflow
+import numpy as np
 
 from graphdoc.data import DspyDataHelper, GenerationDataHelper
 
@@ -22,6 +22,8 @@ log = logging.getLogger(__name__)
 
 
 class DocGeneratorTrainer(SinglePromptTrainer):
+    __slots__ = ("doc_generator_prompt",)
+
     def __init__(
         self,
         prompt: DocGeneratorPrompt,
@@ -30,8 +32,9 @@ class DocGeneratorTrainer(SinglePromptTrainer):
         mlflow_model_name: str,
         mlflow_experiment_name: str,
         mlflow_tracking_uri: str,
-        trainset: List[dspy.Example],
+        trainset: Iterable[dspy.Example],
         evalset: List[dspy.Example],
+        num_threads: int = 32,
     ):
         """Initialize the DocGeneratorTrainer.
 
@@ -48,9 +51,11 @@ class DocGeneratorTrainer(SinglePromptTrainer):
         :param mlflow_tracking_uri: The uri of the mlflow tracking server.
         :type mlflow_tracking_uri: str
         :param trainset: The training set.
-        :type trainset: List[dspy.Example]
+        :type trainset: Iterable[dspy.Example]
         :param evalset: The evaluation set.
         :type evalset: List[dspy.Example]
+        :param num_threads: The number of threads used to evaluate the evalset.
+        :type num_threads: int
 
         """
         super().__init__(
@@ -62,6 +67,7 @@ class DocGeneratorTrainer(SinglePromptTrainer):
             mlflow_tracking_uri,
             trainset,
             evalset,
+            num_threads,
         )
         # Cast to DocGeneratorPrompt for type checking
         if not isinstance(prompt, DocGeneratorPrompt):
@@ -77,12 +83,8 @@ class DocGeneratorTrainer(SinglePromptTrainer):
         :rtype: float
 
         """
-        examples = evaluation["results"]
-        total = 0
-        for ex in examples:
-            rating = math.sqrt(ex[2]) * 25
-            total += rating
-        return round(total / len(examples), 6)
+        scores = np.fromiter((ex[2] for ex in evaluation["results"]), dtype=np.float64)
+        return round(float((np.sqrt(scores) * 25).mean()), 6)
 
     def evaluation_metrics(
         self, base_evaluation: Dict[str, Any], optimized_evaluation: Dict[str, Any]
@@ -106,6 +108,8 @@ class DocGeneratorTrainer(SinglePromptTrainer):
                 "optimized_evaluation_overall_score": optimized_evaluation_overall_score,
             }
         )
+        self.log_example_scores(base_evaluation, optimized_evaluation)
+
         log.info(f"Base Evaluation: {base_evaluation}")
         log.info(f"Optimized Evaluation: {optimized_evaluation}")
         mlflow.log_dict(base_evaluation, "base_evaluation.json")
@@ -123,7 +127,7 @@ class DocGeneratorTrainer(SinglePromptTrainer):
 
         """
         base_prompt = DocGeneratorPrompt(
-            prompt=DspyDataHelper.prompt_signature(base_model),
+            prompt=self.prompt_signature(base_model),
             prompt_type=self.doc_generator_prompt.prompt_type,  # type: ignore
             # TODO: we should have better type checking here
             prompt_metric=self.doc_generator_prompt.prompt_metric,  # type: ignore
@@ -131,15 +135,16 @@ class DocGeneratorTrainer(SinglePromptTrainer):
         )
 
         optimized_prompt = DocGeneratorPrompt(
-            prompt=DspyDataHelper.prompt_signature(optimized_model),
+            prompt=self.prompt_signature(optimized_model),
             prompt_type=self.doc_generator_prompt.prompt_type,  # type: ignore
             # TODO: we should have better type checking here
             prompt_metric=self.doc_generator_prompt.prompt_metric,  # type: ignore
             # TODO: we should have better type checking here
         )
 
-        base_evaluation = base_prompt.evaluate_evalset(self.evalset)
-        optimized_evaluation = optimized_prompt.evaluate_evalset(self.evalset)
+        base_evaluation, optimized_evaluation = self.evaluate_prompts(
+            base_prompt, optimized_prompt
+        )
 
         self.evaluation_metrics(base_evaluation, optimized_evaluation)
         return base_evaluation, optimized_evaluation
@@ -151,7 +156,8 @@ class DocGeneratorTrainer(SinglePromptTrainer):
 
         :param load_model_args: The arguments to load the model from mlflow.
         :type load_model_args: Optional[Dict[str, Any]]
-        :param save_model: Whether to save the model to mlflow.
+        :param save_model: Whether to save the model to mlflow. The model is only
+            saved if it performs better than the base model.
         :type save_model: bool
 
         """
@@ -161,48 +167,56 @@ class DocGeneratorTrainer(SinglePromptTrainer):
         else:
             base_model = self.doc_generator_prompt.infer
 
+        # signatures are memoized per training run
+        self._prompt_signatures.clear()
+
+        # optimizers need random access to the trainset
+        self.materialize_trainset()
+
         # make sure the optimizer_kwargs include the student,
         # overwriting whatever was provided if necessary
         self.optimizer_kwargs["student"] = base_model
 
-        # run the optimizer
-        log.info(f"Running {self.optimizer_type} optimizer...")
-        optimized_model = optimizer_compile(self.optimizer_type, self.optimizer_kwargs)
-
-        # evaluate the training
-        base_evaluation, optimized_evaluation = self.evaluate_training(
-            base_model, optimized_model
-        )
-
-        # log the prompts
-        base_signature = DspyDataHelper.prompt_signature(base_model)
-        optimized_signature = DspyDataHelper.prompt_signature(optimized_model)
+        # compile, evaluate and save the model within a single mlflow run
+        with self.training_run():
+            # run the optimizer
+            log.info(f"Running {self.optimizer_type} optimizer...")
+            optimized_model = optimizer_compile(
+                self.optimizer_type, self.optimizer_kwargs
+            )
 
-        base_prompt = DspyDataHelper.formatted_signature(
-            base_signature, GenerationDataHelper.example_example()
-        )
-        optimized_prompt = DspyDataHelper.formatted_signature(
-            optimized_signature, GenerationDataHelper.example_example()
-        )
+            # evaluate the training
+            base_evaluation, optimized_evaluation = self.evaluate_training(
+                base_model, optimized_model
+            )
 
-        mlflow.log_text(base_prompt, "base_prompt.txt")
-        mlflow.log_text(optimized_prompt, "optimized_prompt.txt")
+            # log the prompts
+            base_signature = self.prompt_signature(base_model)
+            optimized_signature = self.prompt_signature(optimized_model)
 
-        # save the model
-        if save_model:
-            model_signature = GenerationDataHelper.model_signature()
-            self.mlflow_data_helper.save_model(
-                optimized_model, model_signature, self.mlflow_model_name
+            base_prompt = DspyDataHelper.formatted_signature(
+                base_signature, GenerationDataHelper.example_example()
             )
-
-        # compare the models
-        if self.doc_generator_prompt.compare_metrics(
-            base_evaluation, optimized_evaluation
-        ):  # TODO: we should enable the passing of different comparison metrics
-            log.info(
-                "Model training successful, optimized model performs better than base model"
+            optimized_prompt = DspyDataHelper.formatted_signature(
+                optimized_signature, GenerationDataHelper.example_example()
             )
-        else:
-            log.info("Trained model did not improve on base model")
+
+            mlflow.log_text(base_prompt, "base_prompt.txt")
+            mlflow.log_text(optimized_prompt, "optimized_prompt.txt")
+
+            # compare the models, only saving the optimized model if it improved
+            if self.doc_generator_prompt.compare_metrics(
+                base_evaluation, optimized_evaluation
+            ):  # TODO: we should enable the passing of different comparison metrics
+                log.info(
+                    "Model training successful, optimized model performs better than base model"
+                )
+                if save_model:
+                    model_signature = GenerationDataHelper.model_signature()
+                    self.mlflow_data_helper.save_model(
+                        optimized_model, model_signature, self.mlflow_model_name
+                    )
+            else:
+                log.info("Trained model did not improve on base model")
 
         return optimized_model
@@ -4,7 +4,7 @@
 # system packages
 import io
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 # external packages
 import dspy
@@ -22,6 +22,8 @@ log = logging.getLogger(__name__)
 
 
 class DocQualityTrainer(SinglePromptTrainer):
+    __slots__ = ()
+
     def __init__(
         self,
         prompt: DocQualityPrompt,
@@ -30,8 +32,9 @@ class DocQualityTrainer(SinglePromptTrainer):
         mlflow_model_name: str,
         mlflow_experiment_name: str,
         mlflow_tracking_uri: str,
-        trainset: List[dspy.Example],
+        trainset: Iterable[dspy.Example],
         evalset: List[dspy.Example],
+        num_threads: int = 32,
     ):
         """Initialize the DocQualityTrainer. This is the base class for implementing a
         trainer for a DocQualityPrompt.
@@ -49,9 +52,11 @@ class DocQualityTrainer(SinglePromptTrainer):
         :param mlflow_tracking_uri: The uri of the mlflow tracking server.
         :type mlflow_tracking_uri: str
         :param trainset: The training set.
-        :type trainset: List[dspy.Example]
+        :type trainset: Iterable[dspy.Example]
         :param evalset: The evaluation set.
         :type evalset: List[dspy.Example]
+        :param num_threads: The number of threads used to evaluate the evalset.
+        :type num_threads: int
 
         """
         super().__init__(
@@ -63,6 +68,7 @@ class DocQualityTrainer(SinglePromptTrainer):
             mlflow_tracking_uri=mlflow_tracking_uri,
             trainset=trainset,
             evalset=evalset,
+            num_threads=num_threads,
         )
 
     ####################
@@ -88,6 +94,8 @@ class DocQualityTrainer(SinglePromptTrainer):
             }
         )
 
+        self.log_example_scores(base_evaluation, optimized_evaluation)
+
         metrics_data = {
             "Evaluation Type": ["Base Evaluation", "Optimized Evaluation"],
             "Overall Score": [
@@ -127,7 +135,7 @@ class DocQualityTrainer(SinglePromptTrainer):
 
         """
         base_prompt = DocQualityPrompt(
-            prompt=DspyDataHelper.prompt_signature(base_model),
+            prompt=self.prompt_signature(base_model),
             prompt_type=self.prompt.prompt_type,  # type: ignore
             # TODO: we should have better type handling, but we know this works
             prompt_metric=self.prompt.prompt_metric,  # type: ignore
@@ -135,15 +143,16 @@ class DocQualityTrainer(SinglePromptTrainer):
         )
 
         optimized_prompt = DocQualityPrompt(
-            prompt=DspyDataHelper.prompt_signature(optimized_model),
+            prompt=self.prompt_signature(optimized_model),
             prompt_type=self.prompt.prompt_type,  # type: ignore
             # TODO: we should have better type handling, but we know this works
             prompt_metric=self.prompt.prompt_metric,  # type: ignore
             # TODO: we should have better type handling, but we know this works
         )
 
-        base_evaluation = base_prompt.evaluate_evalset(self.evalset)
-        optimized_evaluation = optimized_prompt.evaluate_evalset(self.evalset)
+        base_evaluation, optimized_evaluation = self.evaluate_prompts(
+            base_prompt, optimized_prompt
+        )
 
         self.evaluation_metrics(base_evaluation, optimized_evaluation)
         return base_evaluation, optimized_evaluation
@@ -156,7 +165,8 @@ class DocQualityTrainer(SinglePromptTrainer):
 
         :param load_model_args: The arguments to load the model.
         :type load_model_args: Dict[str, Any]
-        :param save_model: Whether to save the model.
+        :param save_model: Whether to save the model. The model is only saved if it
+            performs better than the base model.
         :type save_model: bool
 
         """
@@ -168,44 +178,52 @@ class DocQualityTrainer(SinglePromptTrainer):
         else:
             base_model = self.prompt.infer
 
+        # signatures are memoized per training run
+        self._prompt_signatures.clear()
+
+        # optimizers need random access to the trainset
+        self.materialize_trainset()
+
         # make sure the optimizer_kwargs include the student,
         # overwriting whatever was provided if necessary
         self.optimizer_kwargs["student"] = base_model
 
-        # run the trainer
-        optimized_model = optimizer_compile(self.optimizer_type, self.optimizer_kwargs)
-
-        # evaluate the training
-        base_evaluation, optimized_evaluation = self.evaluate_training(
-            base_model, optimized_model
-        )
-
-        # log the prompts
-        base_signature = DspyDataHelper.prompt_signature(base_model)
-        optimized_signature = DspyDataHelper.prompt_signature(optimized_model)
+        # compile, evaluate and save the model within a single mlflow run
+        with self.training_run():
+            # run the trainer
+            optimized_model = optimizer_compile(
+                self.optimizer_type, self.optimizer_kwargs
+            )
 
-        base_prompt = DspyDataHelper.formatted_signature(
-            base_signature, QualityDataHelper.example_example()
-        )
-        optimized_prompt = DspyDataHelper.formatted_signature(
-            optimized_signature, QualityDataHelper.example_example()
-        )
+            # evaluate the training
+            base_evaluation, optimized_evaluation = self.evaluate_training(
+                base_model, optimized_model
+            )
 
-        mlflow.log_text(base_prompt, "base_prompt.txt")
-        mlflow.log_text(optimized_prompt, "optimized_prompt.txt")
+            # log the prompts
+            base_signature = self.prompt_signature(base_model)
+            optimized_signature = self.prompt_signature(optimized_model)
 
-        # save the model
-        if save_model:
-            model_signature = QualityDataHelper.model_signature()
-            self.mlflow_data_helper.save_model(
-                optimized_model, model_signature, self.mlflow_model_name
+            base_prompt = DspyDataHelper.formatted_signature(
+                base_signature, QualityDataHelper.example_example()
             )
-
-        # compare the models
-        if self.prompt.compare_metrics(base_evaluation, optimized_evaluation):
-            log.info(
-                "Model training successful, optimized model performs better than base model"
+            optimized_prompt = DspyDataHelper.formatted_signature(
+                optimized_signature, QualityDataHelper.example_example()
             )
-        else:
-            log.info("Trained model did not improve on base model")
+
+            mlflow.log_text(base_prompt, "base_prompt.txt")
+            mlflow.log_text(optimized_prompt, "optimized_prompt.txt")
+
+            # compare the models, only saving the optimized model if it improved
+            if self.prompt.compare_metrics(base_evaluation, optimized_evaluation):
+                log.info(
+                    "Model training successful, optimized model performs better than base model"
+                )
+                if save_model:
+                    model_signature = QualityDataHelper.model_signature()
+                    self.mlflow_data_helper.save_model(
+                        optimized_model, model_signature, self.mlflow_model_name
+                    )
+            else:
+                log.info("Trained model did not improve on base model")
         return optimized_model
@@ -5,7 +5,7 @@ import inspect
 
 # system packages
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 # external packages
 import dspy
@@ -24,46 +24,61 @@ def _optimizer_kwargs_filter(init_signature, optimizer_kwargs: Dict[str, Any]):
     return filtered_kwargs
 
 
+# metric: Callable (this is a function that takes a prediction and an example)
+#
+# miprov2
+# auto: str ("light", "medium", "heavy")
+# ...
+#
+# BootstrapFewShotWithRandomSearch
+# teacher_settings (dict, optional): Settings for the teacher predictor.
+#                                    Defaults to an empty dictionary.
+# max_bootstrapped_demos (int, optional): Maximum number of bootstrapped demonstrations
+#                                         per predictor. Defaults to 4.
+# max_labeled_demos (int, optional): Maximum number of labeled demonstrations
+#                                    per predictor.
+# max_rounds (int, optional): Maximum number of bootstrapping rounds. Defaults to 1.
+# num_candidate_programs (int): Number of candidate programs to generate
+#                               during random search.
+# num_threads (int): Number of threads used for evaluation during random search.
+#                    Defaults to 6.
+# max_errors (int): Maximum errors permitted during evaluation.
+#                   Halts run with the latest error message. Defaults to 10.
+# stop_at_score (float, optional): Score threshold for random search to stop early.
+#                                  Defaults to None.
+# metric_threshold (float, optional): Score threshold for the metric to determine
+#                                     a successful example. Defaults to None.
+_OPTIMIZER_REGISTRY: Dict[str, Callable[..., Any]] = {
+    "miprov2": dspy.MIPROv2,
+    "BootstrapFewShotWithRandomSearch": dspy.BootstrapFewShotWithRandomSearch,
+    "BootstrapFewShot": dspy.BootstrapFewShot,
+    "COPRO": dspy.COPRO,
+}
+
+
 def optimizer_class(optimizer_type: str, optimizer_kwargs: Dict[str, Any]):
-    if optimizer_type == "miprov2":
-        # metric: Callable (this is a function that takes a prediction and an example)
-        # auto: str ("light", "medium", "heavy")
-        # ...
-        return dspy.MIPROv2(
-            **_optimizer_kwargs_filter(
-                init_signature=inspect.signature(dspy.MIPROv2.__init__),
-                optimizer_kwargs=optimizer_kwargs,
-            )
-        )
-    elif optimizer_type == "BootstrapFewShotWithRandomSearch":
-        # metric: Callable (this is a function that takes a prediction and an example)
-        # teacher_settings (dict, optional): Settings for the teacher predictor.
-        #                                    Defaults to an empty dictionary.
-        # max_bootstrapped_demos (int, optional): Maximum number of bootstrapped demonstrations
-        #                                         per predictor. Defaults to 4.
-        # max_labeled_demos (int, optional): Maximum number of labeled demonstrations
-        #                                    per predictor.
-        # max_rounds (int, optional): Maximum number of bootstrapping rounds. Defaults to 1.
-        # num_candidate_programs (int): Number of candidate programs to generate
-        #                               during random search.
-        # num_threads (int): Number of threads used for evaluation during random search.
-        #                    Defaults to 6.
-        # max_errors (int): Maximum errors permitted during evaluation.
-        #                   Halts run with the latest error message. Defaults to 10.
-        # stop_at_score (float, optional): Score threshold for random search to stop early.
-        #                                  Defaults to None.
-        # metric_threshold (float, optional): Score threshold for the metric to determine
-        #                                     a successful example. Defaults to None.
-        return dspy.BootstrapFewShotWithRandomSearch(
-            **_optimizer_kwargs_filter(
-                init_signature=inspect.signature(
-                    dspy.BootstrapFewShotWithRandomSearch.__init__
-                ),
-                optimizer_kwargs=optimizer_kwargs,
-            )
+    """Instantiate the optimizer registered under optimizer_type. Only the kwargs
+    accepted by the optimizer's constructor are passed through.
+
+    :param optimizer_type: The key of the optimizer in the registry.
+    :type optimizer_type: str
+    :param optimizer_kwargs: The keyword arguments for the optimizer.
+    :type optimizer_kwargs: Dict[str, Any]
+    :raises ValueError: If the optimizer type is not registered.
+    :return: The optimizer instance.
+    :rtype: Teleprompter
+
+    """
+    try:
+        optimizer_factory = _OPTIMIZER_REGISTRY[optimizer_type]
+    except KeyError:
+        raise ValueError(f"Invalid optimizer type: {optimizer_type}") from None
+    return optimizer_factory(
+        **_optimizer_kwargs_filter(
+            init_signature=inspect.signature(optimizer_factory),
+            optimizer_kwargs=optimizer_kwargs,
         )
-    else:
-        raise ValueError(f"Invalid optimizer type: {optimizer_type}")
+    )
 
 
 def optimizer_compile(optimizer_type: str, optimizer_kwargs: Dict[str, Any]):
@@ -72,8 +87,20 @@ def optimizer_compile(optimizer_type: str, optimizer_kwargs: Dict[str, Any]):
     Optimizer kwargs are optimizer specific, and must include a student field that maps
     to a dspy.ChainOfThought, dspy.Predict, etc.
 
+    COPRO also requires eval_kwargs, which default to evaluating with the configured
+    num_threads and without a progress bar.
+
     """
     optimizer = optimizer_class(optimizer_type, optimizer_kwargs)
+    if optimizer_type == "COPRO":
+        # COPRO.compile takes a required, keyword-only eval_kwargs
+        optimizer_kwargs = {
+            "eval_kwargs": {
+                "num_threads": optimizer_kwargs.get("num_threads", 1),
+                "display_progress": False,
+            },
+            **optimizer_kwargs,
+        }
     # miprov2
     # student: dspy.ChainOfThought, dspy.Predict, etc.
     # trainset: List[dspy.Example]
@@ -83,6 +110,11 @@ def optimizer_compile(optimizer_type: str, optimizer_kwargs: Dict[str, Any]):
     # BootstrapFewShotWithRandomSearch
     # student: dspy.ChainOfThought, dspy.Predict, etc.
     # trainset: List[dspy.Example]
+
+    # COPRO
+    # student: dspy.ChainOfThought, dspy.Predict, etc.
+    # trainset: List[dspy.Example]
+    # eval_kwargs: Dict[str, Any]
     return optimizer.compile(
         **_optimizer_kwargs_filter(
             init_signature=inspect.signature(optimizer.compile),
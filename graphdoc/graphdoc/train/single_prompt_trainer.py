@@ -4,14 +4,27 @@
 # system packages
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 # external packages
 import dspy
 import mlflow
+import pandas as pd
 
 # internal packages
-from graphdoc.data import MlflowDataHelper
+from graphdoc.data import DspyDataHelper, MlflowDataHelper
 from graphdoc.prompts import SinglePrompt
 
 # logging
@@ -19,6 +32,22 @@ log = logging.getLogger(__name__)
 
 
 class SinglePromptTrainer(ABC):
+    # subclasses must declare their own __slots__ (empty if they add no attributes)
+    # for instances to stay free of a __dict__
+    __slots__ = (
+        "prompt",
+        "optimizer_type",
+        "optimizer_kwargs",
+        "mlflow_model_name",
+        "mlflow_tracking_uri",
+        "mlflow_experiment_name",
+        "trainset",
+        "evalset",
+        "mlflow_data_helper",
+        "num_threads",
+        "_prompt_signatures",
+    )
+
     def __init__(
         self,
         prompt: SinglePrompt,
@@ -27,11 +56,13 @@ class SinglePromptTrainer(ABC):
         mlflow_model_name: str,
         mlflow_experiment_name: str,
         mlflow_tracking_uri: str,
-        trainset: List[dspy.Example],
+        trainset: Iterable[dspy.Example],
         evalset: List[dspy.Example],
+        num_threads: int = 32,
     ):
         """Initialize the SinglePromptTrainer. This is the base class for implementing a
-        trainer for a single prompt.
+        trainer for a single prompt. The trainset may be any iterable of examples, it
+        is only materialized into a list when training starts.
 
         :param prompt: The prompt to train.
         :type prompt: SinglePrompt
@@ -46,9 +77,11 @@ class SinglePromptTrainer(ABC):
         :param mlflow_tracking_uri: The uri of the mlflow tracking server.
         :type mlflow_tracking_uri: str
         :param trainset: The training set.
-        :type trainset: List[dspy.Example]
+        :type trainset: Iterable[dspy.Example]
         :param evalset: The evaluation set.
         :type evalset: List[dspy.Example]
+        :param num_threads: The number of threads used to evaluate the evalset.
+        :type num_threads: int
 
         """
         self.prompt = prompt
@@ -59,6 +92,10 @@ class SinglePromptTrainer(ABC):
         self.mlflow_experiment_name = mlflow_experiment_name
         self.trainset = trainset
         self.evalset = evalset
+        self.num_threads = num_threads
+        self._prompt_signatures: Dict[
+            int, Tuple[Any, Union[dspy.Signature, dspy.SignatureMeta]]
+        ] = {}
 
         # setup mlflow
         log.info("---------------------------------------------------------")
@@ -76,6 +113,113 @@ class SinglePromptTrainer(ABC):
         log.info("Lifecycle_stage: " + str(experiment.lifecycle_stage))
         log.info("---------------------------------------------------------")
 
+    ##################
+    # Helper Methods #
+    ##################
+
+    def prompt_signature(self, model: Any) -> Union[dspy.Signature, dspy.SignatureMeta]:
+        """Return the signature of a model, memoized per model object. The model is
+        held alongside its signature so that an id cannot be reused while it is
+        cached. Call ``_prompt_signatures.clear()`` before the models are modified.
+
+        :param model: The model (dspy.Predict, dspy.ChainOfThought, etc.).
+        :type model: Any
+        :return: The signature of the model.
+        :rtype: Union[dspy.Signature, dspy.SignatureMeta]
+
+        """
+        cached = self._prompt_signatures.get(id(model))
+        if cached is not None and cached[0] is model:
+            return cached[1]
+        signature = DspyDataHelper.prompt_signature(model)
+        self._prompt_signatures[id(model)] = (model, signature)
+        return signature
+
+    def training_run(self) -> ContextManager[mlflow.ActiveRun]:
+        """Return a context manager for the mlflow run that a training run logs to. If
+        a run is already active (e.g. started by the caller) it is reused, otherwise a
+        single run is started for compiling, evaluating and saving the model.
+
+        :return: A context manager yielding the active mlflow run.
+        :rtype: ContextManager[mlflow.ActiveRun]
+
+        """
+        active_run = mlflow.active_run()
+        if active_run is not None:
+            return nullcontext(active_run)
+        return mlflow.start_run(run_name=self.mlflow_model_name)
+
+    def materialize_trainset(self) -> Sequence[dspy.Example]:
+        """Materialize the trainset into a list if it is not already a sequence, as the
+        optimizers require random access to the examples. The materialized trainset
+        is also set on the optimizer kwargs.
+
+        :return: The materialized trainset.
+        :rtype: Sequence[dspy.Example]
+
+        """
+        if not isinstance(self.trainset, Sequence):
+            self.trainset = list(self.trainset)
+        self.optimizer_kwargs["trainset"] = self.trainset
+        return self.trainset
+
+    def evaluate_prompts(
+        self, base_prompt: SinglePrompt, optimized_prompt: SinglePrompt
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Evaluate the base and optimized prompts on the evalset concurrently. The
+        num_threads threads are split between the two evaluations, so the peak number
+        of concurrent language model calls stays at num_threads. Progress bars and
+        result tables are not displayed, as the two evaluations would print over each
+        other.
+
+        :param base_prompt: The prompt of the base model.
+        :type base_prompt: SinglePrompt
+        :param optimized_prompt: The prompt of the optimized model.
+        :type optimized_prompt: SinglePrompt
+        :return: The evaluations of the base and optimized prompts.
+        :rtype: Tuple[Dict[str, Any], Dict[str, Any]]
+
+        """
+        num_threads = max(1, self.num_threads // 2)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            base_future, optimized_future = (
+                executor.submit(
+                    prompt.evaluate_evalset,
+                    self.evalset,
+                    num_threads=num_threads,
+                    display_progress=False,
+                    display_table=False,
+                )
+                for prompt in (base_prompt, optimized_prompt)
+            )
+            return base_future.result(), optimized_future.result()
+
+    def log_example_scores(
+        self, base_evaluation: Dict[str, Any], optimized_evaluation: Dict[str, Any]
+    ) -> pd.DataFrame:
+        """Log the per-example scores of the base and optimized models to mlflow as a
+        single table artifact, rather than one metric call per example.
+
+        :param base_evaluation: The evaluation metrics of the base model.
+        :type base_evaluation: Dict[str, Any]
+        :param optimized_evaluation: The evaluation metrics of the optimized model.
+        :type optimized_evaluation: Dict[str, Any]
+        :return: The per-example scores.
+        :rtype: pd.DataFrame
+
+        """
+        base_results = base_evaluation["results"]
+        optimized_results = optimized_evaluation["results"]
+        df = pd.DataFrame(
+            {
+                "example_id": range(len(base_results)),
+                "base_score": [result[2] for result in base_results],
+                "optimized_score": [result[2] for result in optimized_results],
+            }
+        )
+        mlflow.log_table(data=df, artifact_file="per_example_evaluation.json")
+        return df
+
     ####################
     # Abstract Methods #
     ####################
@@ -114,7 +258,8 @@ class SinglePromptTrainer(ABC):
 
         :param load_model_args: The arguments to load the model.
         :type load_model_args: Dict[str, Any]
-        :param save_model: Whether to save the model.
+        :param save_model: Whether to save the model. The model is only saved if it
+            performs better than the base model.
         :type save_model: bool
 
         """
@@ -10,9 +10,6 @@ import os
 # external packages
 from dotenv import load_dotenv
 
-# internal packages
-from graphdoc.config import doc_generator_eval_from_yaml
-
 # logging
 log = logging.getLogger(__name__)
 
@@ -60,6 +57,9 @@ def main():
     )
     args = parser.parse_args()
 
+    # deferred so that --help and argument errors do not pay for mlflow and dspy
+    from graphdoc.config import doc_generator_eval_from_yaml
+
     # load config
     log.info(f"Loading config from {args.config_path}")
 
@@ -2,21 +2,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import argparse
-import copy
 import logging
 
 # internal packages
 import os
 
 # external packages
-import mlflow
 from dotenv import load_dotenv
 
-from graphdoc.config import single_trainer_from_yaml
-
-# system packages
-from graphdoc.data import load_yaml_config
-
 # logging
 log = logging.getLogger(__name__)
 
@@ -26,6 +19,17 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 HF_DATASET_KEY = os.getenv("HF_DATASET_KEY")
 
 
+def flatten_params(params: dict, prefix: str = "") -> dict:
+    """Flatten a nested config into dotted keys so each value is its own param."""
+    flat = {}
+    for key, value in params.items():
+        if isinstance(value, dict):
+            flat.update(flatten_params(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
 def main():
     parser = argparse.ArgumentParser(description="Train a single prompt model.")
     parser.add_argument(
@@ -36,6 +40,12 @@ def main():
     )
     args = parser.parse_args()
 
+    # deferred so that --help and argument errors do not pay for mlflow and dspy
+    import mlflow
+
+    from graphdoc.config import single_trainer_from_yaml
+    from graphdoc.data import load_yaml_config
+
     # load the trainer object (including trainset and evalset)
     trainer = single_trainer_from_yaml(args.config_path)
 
@@ -43,16 +53,23 @@ def main():
     # trainer.trainset = ...
     # trainer.evalset = ...
 
-    # train the model
-    trainer.train()
+    # train the model and log the parameters to the same run
+    with trainer.training_run():
+        # log the parameters
+        config = load_yaml_config(args.config_path)
+        # only the sections holding secrets are copied before redacting
+        report_config = {
+            **config,
+            "language_model": {**config["language_model"], "api_key": "REDACTED"},
+            "data": {**config["data"], "hf_api_key": "REDACTED"},
+            "trainer": {**config["trainer"], "mlflow_tracking_uri": "REDACTED"},
+        }
+        # logged in the background so that training does not wait on the server
+        log_params = mlflow.log_params(flatten_params(report_config), synchronous=False)
 
-    # log the parameters
-    config = load_yaml_config(args.config_path)
-    report_config = copy.deepcopy(config)
-    report_config["language_model"]["api_key"] = "REDACTED"
-    report_config["data"]["hf_api_key"] = "REDACTED"
-    report_config["trainer"]["mlflow_tracking_uri"] = "REDACTED"
-    mlflow.log_params(report_config)
+        trainer.train()
+        if log_params is not None:
+            log_params.wait()
 
 
 if __name__ == "__main__":
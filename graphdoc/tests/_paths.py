@@ -0,0 +1,20 @@
+# Copyright 2025-, Semiotic AI, Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# system packages
+from pathlib import Path
+
+# test asset paths, resolved once for the whole test suite
+TEST_DIR = Path(__file__).resolve().parent
+BASE_DIR = TEST_DIR.parent
+ASSETS_DIR = TEST_DIR / "assets"
+SCHEMA_DIR = ASSETS_DIR / "schemas"
+CONFIG_DIR = ASSETS_DIR / "configs"
+MLFLOW_DIR = ASSETS_DIR / "mlruns"
+MODEL_URI = str(
+    MLFLOW_DIR
+    / "513408250948216117"
+    / "976d330558344c41b30bd1531571de18"
+    / "artifacts"
+    / "model"
+)
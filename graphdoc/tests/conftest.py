@@ -6,9 +6,10 @@ import logging
 # system packages
 import os
 from enum import Enum
-from pathlib import Path
+from typing import Dict
 
 from dotenv import load_dotenv
+from graphql import DocumentNode
 
 # external packages
 from pytest import fixture
@@ -18,27 +19,19 @@ from graphdoc import (
     DocGeneratorPrompt,
     DocQualityPrompt,
     LocalDataHelper,
+    MlflowDataHelper,
     Parser,
     setup_logging,
 )
+from tests._paths import MLFLOW_DIR, SCHEMA_DIR, TEST_DIR
 
 # logging
 setup_logging("INFO")
 log = logging.getLogger(__name__)
 
 # define test asset paths
-TEST_DIR = Path(__file__).resolve().parent
-ASSETS_DIR = TEST_DIR / "assets"
-MLRUNS_DIR = ASSETS_DIR / "mlruns"
 ENV_PATH = TEST_DIR / ".env"
 
-# Check if .env file exists
-if not ENV_PATH.exists():
-    log.error(f".env file not found at {ENV_PATH}")
-else:
-    log.info(f".env file found at {ENV_PATH}")
-    load_dotenv(dotenv_path=ENV_PATH, override=True)
-
 
 # Set default environment variables if not present
 def ensure_env_vars():
@@ -46,7 +39,7 @@ def ensure_env_vars():
     env_defaults = {
         "OPENAI_API_KEY": None,  # No default, must be provided
         "HF_DATASET_KEY": None,  # No default, must be provided
-        "MLFLOW_TRACKING_URI": str(MLRUNS_DIR),
+        "MLFLOW_TRACKING_URI": str(MLFLOW_DIR),
     }
     log.info(f"Environment variable path: {ENV_PATH}")
 
@@ -68,10 +61,12 @@ def ensure_env_vars():
             log.warning(f"Required environment variable {key} not set")
 
 
-@fixture(autouse=True, scope="session")
-def setup_env():
-    """Fixture to ensure environment is properly set up before each test."""
-    if ENV_PATH.exists():
+def pytest_configure(config):
+    """Load the .env file and environment defaults once, before collection."""
+    if not ENV_PATH.exists():
+        log.error(f".env file not found at {ENV_PATH}")
+    else:
+        log.info(f".env file found at {ENV_PATH}")
         load_dotenv(dotenv_path=ENV_PATH, override=True)
     ensure_env_vars()
 
@@ -104,11 +99,26 @@ class OverwriteSchemaCategoryRatingMapping:
         return mapping.get(category, OverwriteSchemaRating.ZERO)
 
 
-@fixture
+@fixture(scope="session")
 def par() -> Parser:
     return Parser()
 
 
+@fixture(scope="session")
+def parsed_schemas(par: Parser) -> Dict[str, DocumentNode]:
+    """The opensea test schemas, parsed once per session. Tests that modify a
+    schema should work on a deepcopy."""
+    return {
+        schema_file.name: par.parse_schema_from_file(schema_file)
+        for schema_file in sorted(SCHEMA_DIR.glob("opensea_original_schema*.graphql"))
+    }
+
+
+@fixture(scope="session")
+def mdh() -> MlflowDataHelper:
+    return MlflowDataHelper(mlflow_tracking_uri=MLFLOW_DIR)
+
+
 @fixture
 def default_ldh() -> LocalDataHelper:
     return LocalDataHelper()
@@ -143,14 +153,14 @@ def overwrite_ldh() -> LocalDataHelper:
 #             "api_key": api_key,
 #             "cache": True,
 #         },
-#         mlflow_tracking_uri=MLRUNS_DIR,
+#         mlflow_tracking_uri=MLFLOW_DIR,
 #         mlflow_tracking_username=mlflow_tracking_username,
 #         mlflow_tracking_password=mlflow_tracking_password,
 #         log_level="INFO",
 #     )
 
 
-@fixture
+@fixture(scope="session")
 def dqp():
     return DocQualityPrompt(
         prompt="doc_quality",
@@ -159,7 +169,7 @@ def dqp():
     )
 
 
-@fixture
+@fixture(scope="session")
 def dgp():
     return DocGeneratorPrompt(
         prompt="base_doc_gen",
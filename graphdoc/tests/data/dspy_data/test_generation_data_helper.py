@@ -37,6 +37,7 @@ class TestGenerationDataHelper:
     def test_model_signature(self):
         signature = GenerationDataHelper.model_signature()
         assert isinstance(signature, ModelSignature)
+        assert GenerationDataHelper.model_signature() is signature
 
     def test_prediction(self):
         inputs = {
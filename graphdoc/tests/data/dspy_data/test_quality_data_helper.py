@@ -37,6 +37,7 @@ class TestQualityDataHelper:
     def test_model_signature(self):
         signature = QualityDataHelper.model_signature()
         assert isinstance(signature, ModelSignature)
+        assert QualityDataHelper.model_signature() is signature
 
     def test_prediction(self):
         inputs = {
@@ -3,22 +3,19 @@
 
 # system packages
 import logging
-from pathlib import Path
 
 # external packages
 import dspy
 import mlflow
+import pytest
 
 # internal packages
 from graphdoc import MlflowDataHelper
+from tests._paths import MLFLOW_DIR, MODEL_URI
 
 # logging
 log = logging.getLogger(__name__)
 
-# Define the base directory (project root)
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
-MLFLOW_DIR = Path(BASE_DIR) / "tests" / "assets" / "mlruns"
-
 
 class TestMlflowDataHelper:
     def test_init_mlflow_data_helper(self):
@@ -27,62 +24,45 @@ class TestMlflowDataHelper:
         assert isinstance(mdh, MlflowDataHelper)
         assert isinstance(mdh.mlflow_client, mlflow.MlflowClient)
 
-    def test_latest_model_version(self):
-        mdh = MlflowDataHelper(mlflow_tracking_uri=MLFLOW_DIR)
+    def test_latest_model_version(self, mdh: MlflowDataHelper):
         log.info(f"mlflow_tracking_uri: {mdh.mlflow_tracking_uri}")
         model = mdh.latest_model_version(model_name="doc_generator_model")
         assert model is not None
         assert isinstance(model, dspy.ChainOfThought)
 
-    def test_model_by_name_and_version(self):
-        mdh = MlflowDataHelper(mlflow_tracking_uri=MLFLOW_DIR)
+    def test_model_by_name_and_version(self, mdh: MlflowDataHelper):
         model = mdh.model_by_name_and_version(
             model_name="doc_generator_model", model_version="1"
         )
         assert model is not None
         assert isinstance(model, dspy.ChainOfThought)
 
-    def test_model_by_uri(self):
-        model_uri = (
-            Path(MLFLOW_DIR)
-            / "513408250948216117"
-            / "976d330558344c41b30bd1531571de18"
-            / "artifacts"
-            / "model"
-        )
-        mdh = MlflowDataHelper(mlflow_tracking_uri=MLFLOW_DIR)
-        model = mdh.model_by_uri(model_uri=str(model_uri))
+    def test_model_by_uri(self, mdh: MlflowDataHelper):
+        model = mdh.model_by_uri(model_uri=MODEL_URI)
         assert model is not None
         assert isinstance(model, dspy.ChainOfThought)
 
-    def test_model_by_args(self):
-        model_uri = (
-            Path(MLFLOW_DIR)
-            / "513408250948216117"
-            / "976d330558344c41b30bd1531571de18"
-            / "artifacts"
-            / "model"
-        )
-        mdh = MlflowDataHelper(mlflow_tracking_uri=MLFLOW_DIR)
-        model = mdh.model_by_args(load_model_args={"model_name": "doc_generator_model"})
-        assert model is not None
-        assert isinstance(model, dspy.ChainOfThought)
-        model = mdh.model_by_args(
-            load_model_args={"model_name": "doc_generator_model", "model_version": "1"}
-        )
-        assert model is not None
-        assert isinstance(model, dspy.ChainOfThought)
-        model = mdh.model_by_args(load_model_args={"model_uri": str(model_uri)})
-        assert model is not None
-        assert isinstance(model, dspy.ChainOfThought)
-        model = mdh.model_by_args(
-            load_model_args={
-                "model_uri": str(model_uri),
+    def test_model_by_uri_cached_copy(self, mdh: MlflowDataHelper):
+        model = mdh.model_by_uri(model_uri=MODEL_URI)
+        model_again = mdh.model_by_uri(model_uri=MODEL_URI)
+        assert model is not model_again
+        assert model.dump_state() == model_again.dump_state()
+
+    @pytest.mark.parametrize(
+        "load_model_args",
+        [
+            {"model_name": "doc_generator_model"},
+            {"model_name": "doc_generator_model", "model_version": "1"},
+            {"model_uri": MODEL_URI},
+            {
+                "model_uri": MODEL_URI,
                 "model_name": "doc_generator_model",
                 "model_version": "1",
-            }
-        )
-        assert model is not None
+            },
+        ],
+    )
+    def test_model_by_args(self, mdh: MlflowDataHelper, load_model_args: dict):
+        model = mdh.model_by_args(load_model_args=load_model_args)
         assert isinstance(model, dspy.ChainOfThought)
 
     # def test_save_model(self):
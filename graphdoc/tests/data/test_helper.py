@@ -3,11 +3,10 @@
 
 # system packages
 import logging
-import os
-from pathlib import Path
 
 # external packages
 import pytest
+import yaml
 
 # internal packages
 from graphdoc import (
@@ -16,15 +15,12 @@ from graphdoc import (
     load_yaml_config,
     setup_logging,
 )
+from graphdoc.data import helper, load_yaml_config_redacted
+from tests._paths import CONFIG_DIR, SCHEMA_DIR
 
 # logging
 log = logging.getLogger(__name__)
 
-# Define the base directory (project root)
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-SCHEMA_DIR = BASE_DIR / "tests" / "assets" / "schemas"
-CONFIG_DIR = BASE_DIR / "tests" / "assets" / "configs"
-
 
 class TestHelper:
     @pytest.fixture(autouse=True)
@@ -46,13 +42,13 @@ class TestHelper:
             check_file_path(str(SCHEMA_DIR / "opensea_original_schema.graphql")) is None
         )
 
-    def test_load_yaml_config(self):
+    def test_load_yaml_config(self, monkeypatch):
         OPENAI_API_KEY = "test"
         HF_DATASET_KEY = "test"
         MLFLOW_TRACKING_URI = "test"
-        os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
-        os.environ["HF_DATASET_KEY"] = HF_DATASET_KEY
-        os.environ["MLFLOW_TRACKING_URI"] = MLFLOW_TRACKING_URI
+        monkeypatch.setenv("OPENAI_API_KEY", OPENAI_API_KEY)
+        monkeypatch.setenv("HF_DATASET_KEY", HF_DATASET_KEY)
+        monkeypatch.setenv("MLFLOW_TRACKING_URI", MLFLOW_TRACKING_URI)
         config_path = CONFIG_DIR / "single_prompt_trainer.yaml"
         config = load_yaml_config(str(config_path))
         assert config is not None
@@ -62,9 +58,26 @@ class TestHelper:
         assert config["data"]["hf_api_key"] == HF_DATASET_KEY
         assert config["trainer"]["mlflow_tracking_uri"] is not None
         assert config["trainer"]["mlflow_tracking_uri"] == MLFLOW_TRACKING_URI
-        del os.environ["OPENAI_API_KEY"]
-        del os.environ["HF_DATASET_KEY"]
-        del os.environ["MLFLOW_TRACKING_URI"]
+        # the configs should be parsed by the libyaml bindings when they are available
+        if yaml.__with_libyaml__:
+            assert issubclass(helper._EnvSafeLoader, yaml.CSafeLoader)
+
+    def test_load_yaml_config_redacted(self, monkeypatch):
+        for env_var in [
+            "OPENAI_API_KEY",
+            "HF_DATASET_KEY",
+            "MLFLOW_TRACKING_URI",
+            "MLFLOW_TRACKING_USERNAME",
+            "MLFLOW_TRACKING_PASSWORD",
+        ]:
+            monkeypatch.setenv(env_var, "test")
+        config_path = CONFIG_DIR / "single_prompt_trainer.yaml"
+        redacted = load_yaml_config_redacted(str(config_path))
+        assert redacted["language_model"]["lm_api_key"] == "redacted"
+
+        # redacting must not leak into later loads
+        config = load_yaml_config(str(config_path))
+        assert config["language_model"]["lm_api_key"] == "test"
 
     def test_setup_logging(self):
         root_logger = logging.getLogger()
@@ -3,12 +3,15 @@
 
 # system packages
 import logging
+import os
+import shutil
 from pathlib import Path
 
 from datasets import Dataset
 
 # internal packages
-from graphdoc.data import LocalDataHelper, SchemaObject
+from graphdoc.data import LocalDataHelper, SchemaCategoryPath, SchemaObject, local
+from tests._paths import SCHEMA_DIR
 
 # external packages
 
@@ -16,14 +19,10 @@ from graphdoc.data import LocalDataHelper, SchemaObject
 # logging
 log = logging.getLogger(__name__)
 
-# global variables
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-SCHEMA_DIR = BASE_DIR / "tests" / "assets" / "schemas"
-
 
 class TestLocalDataHelper:
     def test_schema_objects_from_folder(self, default_ldh: LocalDataHelper):
-        folder_path = Path(SCHEMA_DIR) / "perfect"
+        folder_path = SCHEMA_DIR / "perfect"
         ldh = default_ldh
         schema_objects = ldh.schema_objects_from_folder(
             category="perfect", rating=4, folder_path=folder_path
@@ -56,3 +55,46 @@ class TestLocalDataHelper:
         dataset = ldh.folder_of_folders_to_dataset(parse_objects=True)
         assert isinstance(dataset, Dataset)
         assert dataset.num_rows == 40
+
+    def test_folder_of_folders_to_dataset_cache(
+        self, default_ldh: LocalDataHelper, tmp_path: Path
+    ):
+        ldh = default_ldh
+        ldh.schema_directory_path = SCHEMA_DIR
+        dataset = ldh.folder_of_folders_to_dataset(
+            parse_objects=False, cache_dir=tmp_path
+        )
+        assert len(list(tmp_path.iterdir())) == 1
+        cached = ldh.folder_of_folders_to_dataset(
+            parse_objects=False, cache_dir=tmp_path
+        )
+        assert isinstance(cached, Dataset)
+        assert cached.to_list() == dataset.to_list()
+        ldh.folder_of_folders_to_dataset(parse_objects=True, cache_dir=tmp_path)
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_folder_of_folders_to_dataset_cache_key(self, default_ldh: LocalDataHelper):
+        ldh = default_ldh
+        ldh.schema_directory_path = SCHEMA_DIR
+        key = ldh._dataset_cache_key(SchemaCategoryPath, False, None)
+        assert key == ldh._dataset_cache_key(SchemaCategoryPath, False, None)
+        ldh.categories_ratings = lambda category: 0
+        assert key != ldh._dataset_cache_key(SchemaCategoryPath, False, None)
+
+    def test_folder_of_folders_to_dataset_cache_race(
+        self, default_ldh: LocalDataHelper, tmp_path: Path, monkeypatch
+    ):
+        ldh = default_ldh
+        ldh.schema_directory_path = SCHEMA_DIR
+        replace = os.replace
+
+        def replace_after_another_writer(src, dst):
+            shutil.copytree(src, dst)
+            replace(src, dst)
+
+        monkeypatch.setattr(local.os, "replace", replace_after_another_writer)
+        dataset = ldh.folder_of_folders_to_dataset(
+            parse_objects=False, cache_dir=tmp_path
+        )
+        assert len(list(tmp_path.iterdir())) == 1
+        assert dataset.num_rows == 4
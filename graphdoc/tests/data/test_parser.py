@@ -2,8 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 # system packages
+import copy
 import logging
-from pathlib import Path
+from typing import Dict
 
 # external packages
 from graphql import (
@@ -15,14 +16,11 @@ from graphql import (
 
 # internal packages
 from graphdoc import Parser, SchemaObject
+from tests._paths import SCHEMA_DIR
 
 # logging
 log = logging.getLogger(__name__)
 
-# global variables
-BASE_DIR = Path(__file__).resolve().parent.parent.parent
-SCHEMA_DIR = BASE_DIR / "tests" / "assets" / "schemas"
-
 
 class TestParser:
     def test__check_node_type(self, par: Parser):
@@ -75,12 +73,16 @@ class TestParser:
             schema_file, schema_directory_path=SCHEMA_DIR
         )
         assert isinstance(schema, DocumentNode)
-
-    def test_update_node_descriptions(self, par: Parser):
-        schema_file = "opensea_original_schema.graphql"
+        assert schema.loc is not None
         schema = par.parse_schema_from_file(
-            schema_file, schema_directory_path=SCHEMA_DIR
+            schema_file, schema_directory_path=SCHEMA_DIR, no_location=True
         )
+        assert schema.loc is None
+
+    def test_update_node_descriptions(
+        self, par: Parser, parsed_schemas: Dict[str, DocumentNode]
+    ):
+        schema = copy.deepcopy(parsed_schemas["opensea_original_schema.graphql"])
         updated_schema = par.update_node_descriptions(
             node=schema, new_value="This is a test description"
         )
@@ -91,17 +93,19 @@ class TestParser:
                     test_node_definition = definitions[i].fields[x].description.value
                     assert test_node_definition == "This is a test description"
 
-    def test_count_description_pattern_matching(self, par: Parser):
-        gold_schema_file = SCHEMA_DIR / "opensea_original_schema_pattern.graphql"
-        gold_schema = par.parse_schema_from_file(gold_schema_file)
+    def test_count_description_pattern_matching(
+        self, par: Parser, parsed_schemas: Dict[str, DocumentNode]
+    ):
+        gold_schema = parsed_schemas["opensea_original_schema_pattern.graphql"]
         counts = par.count_description_pattern_matching(gold_schema, "test")
         assert counts["total"] == 12
         assert counts["pattern"] == 3
         assert counts["empty"] == 4
 
-    def test_fill_empty_descriptions(self, par: Parser):
-        schema_file = SCHEMA_DIR / "opensea_original_schema_sparse.graphql"
-        schema = par.parse_schema_from_file(schema_file)
+    def test_fill_empty_descriptions(
+        self, par: Parser, parsed_schemas: Dict[str, DocumentNode]
+    ):
+        schema = copy.deepcopy(parsed_schemas["opensea_original_schema_sparse.graphql"])
         updated_schema = par.fill_empty_descriptions(schema)
         definitions = getattr(updated_schema, "definitions", None)
 
@@ -130,16 +134,13 @@ class TestParser:
                 test_entity_description_updated == "Description for table: Marketplace"
             )
 
-    def test_schema_equality_check(self, par: Parser):
-        gold_schema_file = SCHEMA_DIR / "opensea_original_schema.graphql"
-        silver_schema_file = (
-            SCHEMA_DIR
-            / "opensea_original_schema_sparse.graphql"  # only the comments are different
-        )
-        check_schema_file = SCHEMA_DIR / "opensea_original_schema_modified.graphql"
-        gold_schema = par.parse_schema_from_file(gold_schema_file)
-        silver_schema = par.parse_schema_from_file(silver_schema_file)
-        check_schema = par.parse_schema_from_file(check_schema_file)
+    def test_schema_equality_check(
+        self, par: Parser, parsed_schemas: Dict[str, DocumentNode]
+    ):
+        gold_schema = parsed_schemas["opensea_original_schema.graphql"]
+        # only the comments are different
+        silver_schema = parsed_schemas["opensea_original_schema_sparse.graphql"]
+        check_schema = parsed_schemas["opensea_original_schema_modified.graphql"]
 
         assert par.schema_equality_check(gold_schema, gold_schema)
         assert par.schema_equality_check(gold_schema, silver_schema)
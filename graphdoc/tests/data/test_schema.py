@@ -164,3 +164,5 @@ class TestSchema:
         dataset = schema_objects_to_dataset(schema_objects)
         assert dataset.num_rows == 5
         assert isinstance(dataset, Dataset)
+        assert dataset.features == schema_object.to_dataset().features
+        assert dataset[0] == schema_object.to_dataset()[0]
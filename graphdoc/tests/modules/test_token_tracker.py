@@ -0,0 +1,38 @@
+# Copyright 2025-, Semiotic AI, Inc.
+# SPDX-License-Identifier: Apache-2.0
+
+# system packages
+import logging
+
+# external packages
+from litellm.types.utils import ModelResponse
+
+# internal packages
+from graphdoc.modules.token_tracker import TokenTracker
+
+# logging
+log = logging.getLogger(__name__)
+
+
+class TestTokenTracker:
+    def test_global_token_callback(self):
+        token_tracker = TokenTracker()
+        response = ModelResponse(
+            model="gpt-4o-mini",
+            usage={
+                "prompt_tokens": 1200,
+                "completion_tokens": 30,
+                "total_tokens": 1230,
+                "prompt_tokens_details": {"cached_tokens": 1024},
+            },
+        )
+        token_tracker.global_token_callback({}, response, None, None)
+        token_tracker.global_token_callback(
+            {}, {"model": "gpt-4o-mini", "usage": {"prompt_tokens": 10}}, None, None
+        )
+        assert token_tracker.process_callback_queue(timeout=0) == 2
+        stats = token_tracker.stats()
+        assert stats["api_call_count"] == 2
+        assert stats["prompt_tokens"] == 1210
+        assert stats["cached_prompt_tokens"] == 1024
+        assert stats["total_tokens"] == 1230
@@ -8,6 +8,10 @@ import logging
 from graphdoc import DocGeneratorPrompt, DocQualityPrompt, PromptFactory
 
 # external packages
+import dspy
+import pytest
+from mlflow.tracing import disable, enable
+from mlflow.tracing.provider import is_tracing_enabled
 
 # logging
 log = logging.getLogger(__name__)
@@ -30,3 +34,27 @@ class TestPromptInit:
         )
         assert isinstance(dqp, DocQualityPrompt)
         assert isinstance(dgp, DocGeneratorPrompt)
+
+    @pytest.mark.parametrize("prompt_fixture", ["dgp", "dqp"])
+    def test_prompt_prefix_is_static(self, prompt_fixture, request):
+        # the schema should only appear in the final message, so that the
+        # instructions form a stable prefix that providers can cache
+        prompt = request.getfixturevalue(prompt_fixture)
+        signature = prompt.infer.predictors()[0].signature
+        adapter = dspy.ChatAdapter()
+        # formatting is traced when dspy autologging is on, keep it out of mlruns
+        tracing_enabled = is_tracing_enabled()
+        disable()
+        try:
+            first = adapter.format(
+                signature, demos=[], inputs={"database_schema": "type A { a: Int }"}
+            )
+            second = adapter.format(
+                signature, demos=[], inputs={"database_schema": "type B { b: Int }"}
+            )
+        finally:
+            if tracing_enabled:
+                enable()
+        assert first[:-1] == second[:-1]
+        assert "type A { a: Int }" in first[-1]["content"]
+        assert "type A { a: Int }" not in str(first[:-1])
@@ -5,13 +5,14 @@
 import logging
 
 # external packages
-from dotenv import load_dotenv
+from graphql import DocumentNode
 
 # internal packages
 from graphdoc import (
     DocGeneratorPrompt,
     DocQualityPrompt,
     LocalDataHelper,
+    MlflowDataHelper,
     Parser,
 )
 
@@ -24,9 +25,6 @@ from .conftest import (
 # logging
 log = logging.getLogger(__name__)
 
-# load the environment variables
-load_dotenv("../.env")
-
 
 class TestFixtures:
     def test_parser(self, par: Parser):
@@ -37,6 +35,15 @@ class TestFixtures:
         assert default_ldh is not None
         assert isinstance(default_ldh, LocalDataHelper)
 
+    def test_parsed_schemas(self, parsed_schemas: dict):
+        assert len(parsed_schemas) == 4
+        for schema in parsed_schemas.values():
+            assert isinstance(schema, DocumentNode)
+
+    def test_mdh(self, mdh: MlflowDataHelper):
+        assert mdh is not None
+        assert isinstance(mdh, MlflowDataHelper)
+
     def test_overwrite_ldh(self, overwrite_ldh: LocalDataHelper):
         assert overwrite_ldh is not None
         assert isinstance(overwrite_ldh, LocalDataHelper)
@@ -3,7 +3,6 @@
 
 # system packages
 import logging
-from pathlib import Path
 
 # external packages
 import dspy
@@ -31,15 +30,11 @@ from graphdoc.config import (
     trainset_from_dict,
     trainset_from_yaml,
 )
+from tests._paths import CONFIG_DIR
 
 # logging
 log = logging.getLogger(__name__)
 
-# Define the base directory (project root)
-BASE_DIR = Path(__file__).resolve().parent.parent
-SCHEMA_DIR = BASE_DIR / "tests" / "assets" / "schemas"
-CONFIG_DIR = BASE_DIR / "tests" / "assets" / "configs"
-
 
 class TestConfig:
 
@@ -57,6 +52,19 @@ class TestConfig:
         assert len(trainset) > 0
         assert isinstance(trainset[0], dspy.Example)
 
+    def test_trainset_from_dict_returns_new_list(self):
+        config_path = CONFIG_DIR / "single_prompt_doc_quality_trainer.yaml"
+        data_dict = load_yaml_config(config_path)["data"]
+
+        trainset = trainset_from_dict(data_dict)
+        trainset_again = trainset_from_dict(data_dict)
+        assert trainset == trainset_again
+        assert trainset is not trainset_again
+        assert trainset[0] is not trainset_again[0]
+        assert trainset[0].inputs() == trainset_again[0].inputs()
+        trainset[0].database_schema = "mutated"
+        assert trainset_from_dict(data_dict)[0].database_schema != "mutated"
+
     def test_trainset_from_yaml(self):
         config_path = CONFIG_DIR / "single_prompt_doc_quality_trainer.yaml"
         trainset = trainset_from_yaml(config_path)
@@ -79,6 +87,17 @@ class TestConfig:
         assert isinstance(evalset, list)
         assert len(evalset) == 2
 
+    def test_split_trainset_is_deterministic(self):
+        examples = [dspy.Example(database_schema=str(i)) for i in range(10)]
+        original = list(examples)
+        first = split_trainset(examples, 0.2, seed=7)
+        second = split_trainset(examples, 0.2, seed=7)
+        assert first == second
+        assert examples == original
+        assert len(first[0]) == 8
+        assert len(first[1]) == 2
+        assert set(first[0] + first[1]) == set(original)
+
     def test_trainset_and_evalset_from_yaml(self):
         config_path = CONFIG_DIR / "single_prompt_doc_quality_trainer.yaml"
         trainset, evalset = trainset_and_evalset_from_yaml(config_path)
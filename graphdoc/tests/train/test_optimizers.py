@@ -12,6 +12,7 @@ import pytest
 from graphdoc import (
     DocQualityPrompt,
     optimizer_class,
+    optimizer_compile,
 )
 
 # logging
@@ -45,6 +46,44 @@ class TestOptimizers:
         )
         assert isinstance(optimizer, dspy.BootstrapFewShotWithRandomSearch)
 
+    def test_optimizer_class_copro(self, dqp: DocQualityPrompt):
+        optimizer_kwargs = {
+            "metric": dqp.evaluate_metric,
+            "breadth": 4,
+            "depth": 2,
+            "student": None,
+        }
+        optimizer = optimizer_class("COPRO", optimizer_kwargs)
+        assert isinstance(optimizer, dspy.COPRO)
+        assert optimizer.breadth == 4
+
+    def test_optimizer_compile_copro(self, dqp: DocQualityPrompt, monkeypatch):
+        compile_kwargs = {}
+
+        def compile(self, student, *, trainset, eval_kwargs):
+            compile_kwargs.update(
+                student=student, trainset=trainset, eval_kwargs=eval_kwargs
+            )
+            return student
+
+        monkeypatch.setattr(dspy.COPRO, "compile", compile)
+        student = dspy.Predict(dqp.prompt)
+        optimizer_kwargs = {
+            "metric": dqp.evaluate_metric,
+            "student": student,
+            "trainset": [],
+            "num_threads": 4,
+        }
+        assert optimizer_compile("COPRO", optimizer_kwargs) is student
+        assert compile_kwargs["eval_kwargs"] == {
+            "num_threads": 4,
+            "display_progress": False,
+        }
+
+        optimizer_kwargs["eval_kwargs"] = {"num_threads": 2}
+        optimizer_compile("COPRO", optimizer_kwargs)
+        assert compile_kwargs["eval_kwargs"] == {"num_threads": 2}
+
     def test_optimizer_class_invalid_type(self):
         with pytest.raises(ValueError, match="Invalid optimizer type: invalid_type"):
             optimizer_class("invalid_type", {})